@@ -76,10 +76,17 @@ class Button:
             surf = pygame.transform.scale(surf, (width, height))
         return surf
 
+    def get_look(self):
+        """ Everything that decides what draw() puts on screen, so callers
+            can skip redrawing a button that hasn't changed.
+        """
+        return self.enabled, self.clicked, self.is_hovered(), self.scale
+
     def draw(self, surface, xoff=0, yoff=0):
+        """ Draw the button, and return the rectangle it covers. """
         x = self.x - self.width * self.scale/2 + xoff
         y = self.y - self.height * self.scale/2 + yoff
-        surface.blit(self.get_surf(), (x, y))
+        return surface.blit(self.get_surf(), (x, y))
 
     def update(self, dt, events):
         for event in events:
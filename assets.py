@@ -0,0 +1,186 @@
+import io
+import pygame
+import threading
+
+
+class AssetRegistry:
+    """ Process-wide cache of loaded assets. Each file is read from disk once,
+        and every caller asking for it afterwards gets the same shared object,
+        so callers should treat what they get back as read-only.
+    """
+
+    #   Colors to key out paletted images with once they are converted. The
+    #   first one that isn't already in an image's palette is used.
+    key_colors = [(254, 0, 0), (255, 0, 255), (1, 254, 1)]
+
+    def __init__(self):
+        self.cache = {}
+        self.sources = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.worker = None
+        self.worker_error = None
+        self.preloaded = {}  # path -> decoded image, or file contents, from preload()
+        self.taken = set()  # paths already asked for, which preload() can skip
+
+    def get(self, key, loader):
+        """ Return the asset stored under key, calling loader() to create it
+            the first time it is asked for. The lock isn't held while loader
+            runs; if two threads load the same key at once, both get the
+            first one stored.
+        """
+        with self.lock:
+            if key in self.cache:
+                self.hits += 1
+                return self.cache[key]
+            self.misses += 1
+        asset = loader()
+        with self.lock:
+            return self.cache.setdefault(key, asset)
+
+    def preload(self, paths):
+        """ Read the files at paths on a background thread, decoding the
+            images, so the first request for each only has to finish it off.
+            Nothing there touches the display, mixer or font system; those
+            only happen on the thread that asks for the asset.
+        """
+        def run():
+            try:
+                for path in paths:
+                    with self.lock:
+                        if path in self.taken:
+                            continue
+                    if path.endswith(".png"):
+                        data = pygame.image.load(path)
+                    else:
+                        with open(path, "rb") as file:
+                            data = file.read()
+                    with self.lock:
+                        if path not in self.taken:
+                            self.preloaded[path] = data
+            except Exception as error:
+                self.worker_error = error
+        self.worker_error = None
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+
+    def take(self, path):
+        """ Return what preload() read from path, or None if it hasn't got
+            to it, and stop it from reading it later.
+        """
+        with self.lock:
+            self.taken.add(path)
+            return self.preloaded.pop(path, None)
+
+    def discard_preloaded(self):
+        """ Drop whatever preload() read that nothing has asked for """
+        with self.lock:
+            self.preloaded = {}
+
+    def ready(self):
+        return self.worker is None or not self.worker.is_alive()
+
+    def wait(self):
+        """ Block until the preload started with preload() has finished, and
+            re-raise anything it failed with.
+        """
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+        if self.worker_error is not None:
+            error, self.worker_error = self.worker_error, None
+            raise error
+
+    def image(self, path, colorkey=None):
+        """ Return the image at path in the display's pixel format, with
+            colorkey (if given) keyed out.
+        """
+        key = ("image", path, colorkey)
+
+        def load():
+            surf = self.take(path)
+            if surf is None:
+                surf = pygame.image.load(path)
+            if colorkey is not None:
+                surf.set_colorkey(colorkey)
+            self.sources[key] = surf
+            return self.convert(surf)
+        return self.get(key, load)
+
+    def convert(self, surf):
+        """ Return a copy of surf in the display's pixel format, so blitting
+            it doesn't need a per-pixel conversion. Transparency is kept the
+            way the surface already had it: per-pixel alpha stays alpha, and
+            colorkeyed surfaces stay colorkeyed.
+        """
+        if not pygame.display.get_surface():
+            return surf
+        if surf.get_flags() & pygame.SRCALPHA:
+            converted = surf.convert_alpha()
+            converted.set_colorkey(surf.get_colorkey())
+            return converted
+        if surf.get_colorkey() is None or surf.get_bitsize() > 8:
+            return surf.convert()
+
+        #   Paletted images key out a palette index, not a color, and the key
+        #   color is often repeated in the palette. Flatten onto a color the
+        #   palette doesn't use so only the keyed pixels stay transparent.
+        #   Keyed blits of the flattened copy are slower than of the 8-bit
+        #   original unless the transparent runs are skipped, so it's also
+        #   run-length encoded.
+        palette = {tuple(color)[:3] for color in surf.get_palette()}
+        key_color = next(color for color in self.key_colors if color not in palette)
+        flat = pygame.Surface(surf.get_size()).convert()
+        flat.fill(key_color)
+        flat.blit(surf, (0, 0))
+        flat.set_colorkey(key_color, pygame.RLEACCEL)
+        return flat
+
+    def reconvert(self):
+        """ Convert every cached image again for the current display mode.
+            Sprite sheets are rebuilt the next time they are asked for.
+        """
+        with self.lock:
+            for key, source in self.sources.items():
+                self.cache[key] = self.convert(source)
+            for key in [key for key in self.cache if key[0] == "sprite_sheet"]:
+                del self.cache[key]
+
+    def sprite_sheet(self, path, sheet_size, frame_num, repeat=True, reversed=False, xflip=False):
+        from sprite import SpriteSheet
+
+        def load():
+            return SpriteSheet(path, sheet_size, frame_num, repeat=repeat, reversed=reversed, xflip=xflip)
+        return self.get(("sprite_sheet", path, sheet_size, frame_num, repeat, reversed, xflip), load)
+
+    def open(self, path):
+        """ path's contents as a file, if preload() has read them, or else
+            path itself, to pass to whatever loads it.
+        """
+        data = self.take(path)
+        return path if data is None else io.BytesIO(data)
+
+    def sound(self, path, volume=None):
+        sound = self.get(("sound", path), lambda: pygame.mixer.Sound(self.open(path)))
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def font(self, path, size):
+        return self.get(("font", path, size), lambda: pygame.font.Font(self.open(path), size))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.cache)}
+
+    def clear(self):
+        with self.lock:
+            self.cache = {}
+            self.sources = {}
+            self.preloaded = {}
+            self.taken = set()
+            self.hits = 0
+            self.misses = 0
+
+
+assets = AssetRegistry()
@@ -0,0 +1,180 @@
+import math
+
+import pygame
+
+import constants as c
+from lighting import LightingTable
+from render import RenderTarget
+
+
+class BackgroundCompositor:
+    """ Draws the scenery behind the action for Game.draw_background. The
+        sky, its reflection, the sun and the shade over the water only change
+        with the time of day, so while the screen is still they're composed
+        into one surface per lighting step and drawn with a single blit. Only
+        the scrolling buildings and the layers on top are drawn every frame.
+
+        With a scale below 1, it draws onto a RenderTarget of that scale,
+        straight onto its offscreen surface from scaled-down copies of the
+        layers.
+    """
+
+    def __init__(self, game, scale=1):
+        self.game = game
+        self.scale = scale
+        self.size = (round(c.GAME_WIDTH * scale), round(c.GAME_HEIGHT * scale))
+        self.lighting = LightingTable(game)
+        self.far = pygame.Surface(self.size)
+        self.far_step = None
+        self.shaded_reflections = {}  # water shade alpha -> building reflection darkened by it
+        self.building_strip = None
+        self.building_strip_alpha = None
+
+        self.background = self.scaled(game.background)
+        self.background_reflection = self.scaled(game.background_reflection)
+        self.sun = self.scaled(game.sun)
+        self.water_shade = self.scaled(game.water_shade)
+        self.water_texture = self.scaled(game.water_texture)
+        self.buildings = self.scaled(game.background_buildings)
+        #   Flipped here rather than taken from the game so it keeps the key
+        #   the buildings were converted with
+        self.bb_reflection = pygame.transform.flip(self.buildings, 0, 1)
+        self.bb_reflection.set_colorkey(self.buildings.get_colorkey())
+        self.train = self.scaled(game.train)
+
+        #   Run-length encoded copy of the foreground, which is mostly see-through
+        self.foreground = self.scaled(game.foreground_buildings).copy()
+        self.foreground.set_colorkey(game.foreground_buildings.get_colorkey(), pygame.RLEACCEL)
+
+        #   Night tint, refilled only when the lighting step changes
+        self.tint = pygame.Surface(self.size)
+        self.tint_key = None
+        self.lit_multiply = pygame.Surface(self.size)
+        self.lit_multiply.fill(self.lighting.lit_multiply)
+
+    def scaled(self, surf):
+        """ surf at the render scale, keeping its colorkey """
+        if self.scale == 1:
+            return surf
+        width, height = surf.get_size()
+        scaled = pygame.transform.scale(surf, (max(1, int(width * self.scale)), max(1, int(height * self.scale))))
+        if surf.get_colorkey() is not None:
+            scaled.set_colorkey(surf.get_colorkey())
+        return scaled
+
+    def shaded_reflection(self, alpha):
+        """ The building reflection as it looks under the water shade at
+            alpha, so it can be drawn on top of a cached, already shaded sky.
+            The shade is blended in the same way the sky's is, and the
+            keyed-out pixels are put back afterwards.
+        """
+        if alpha not in self.shaded_reflections:
+            reflection = self.bb_reflection
+            key = reflection.get_colorkey()
+            shaded = reflection.copy()
+            shaded.set_colorkey(None)
+            self.water_shade.set_alpha(alpha)
+            shaded.blit(self.water_shade, (0, 0))
+            keyed = pygame.mask.from_threshold(reflection, key, (1, 1, 1, 255))
+            keyed.to_surface(shaded, setcolor=key, unsetcolor=None)
+            shaded.set_colorkey(key)
+            self.shaded_reflections[alpha] = shaded
+        return self.shaded_reflections[alpha]
+
+    def get_building_strip(self, alpha):
+        """ The background buildings over their reflection under the water
+            shade at alpha, tiled wide enough that any scroll position is
+            covered by one blit. Only the current shade's strip is kept.
+        """
+        if alpha != self.building_strip_alpha:
+            buildings = self.buildings
+            reflection = self.shaded_reflection(alpha)
+            bbw, bbh = buildings.get_size()
+            key = buildings.get_colorkey()
+            tiles = math.ceil(self.size[0] / bbw) + 1
+            strip = pygame.Surface((bbw * tiles, bbh * 2))
+            strip.fill(key)
+            for tile in range(tiles):
+                strip.blit(buildings, (tile * bbw, 0))
+                strip.blit(reflection, (tile * bbw, bbh))
+            strip.set_colorkey(key, pygame.RLEACCEL)
+            self.building_strip = strip
+            self.building_strip_alpha = alpha
+        return self.building_strip
+
+    def draw_far(self, surf, step, offset):
+        """ Sky, sky reflection, sun and water shade """
+        game = self.game
+        lighting = self.lighting
+        scale = self.scale
+        ba = pygame.Rect((0, lighting.sky_top[step] * scale, self.size[0], game.horizon * scale))
+        surf.blit(self.background, (0, 0), area=ba)
+        bra = pygame.Rect((0, lighting.reflection_top[step] * scale, self.size[0], (c.GAME_HEIGHT - game.horizon) * scale))
+        surf.blit(self.background_reflection, (0, game.horizon * scale), area=bra)
+
+        sx = self.size[0]//2 - self.sun.get_width()//2 + offset[0] * scale
+        sy = int((lighting.sun_y[step] + offset[1]) * scale)
+        sa = (0, 0, self.sun.get_width(), int(lighting.sun_height[step] * scale))
+        surf.blit(self.sun, (sx, sy), area=sa)
+
+        self.water_shade.set_alpha(lighting.shade_alpha[step])
+        surf.blit(self.water_shade, (0, (game.horizon + offset[1]) * scale))
+
+    def draw_tint(self, surf, step):
+        """ The night tint, and the lightener in colorblind mode. Together
+            they're one multiply and one add, both looked up per step.
+        """
+        colorblind = self.game.colorblind_mode
+        if self.tint_key != (step, colorblind):
+            table = self.lighting.lit_tint if colorblind else self.lighting.tint
+            self.tint.fill(table[step])
+            self.tint_key = (step, colorblind)
+        if colorblind:
+            surf.blit(self.lit_multiply, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        surf.blit(self.tint, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    def draw(self, surf, offset=(0, 0)):
+        game = self.game
+        scale = self.scale
+        step = self.lighting.step(game.day)
+        target = surf.surface if isinstance(surf, RenderTarget) else surf
+
+        if int(offset[0] * scale) == 0 and int(offset[1] * scale) == 0:
+            if step != self.far_step:
+                self.draw_far(self.far, step, (0, 0))
+                self.far_step = step
+            target.blit(self.far, (0, 0))
+        else:
+            #   The sun and water shake with the screen, so there's nothing to reuse
+            self.draw_far(target, step, offset)
+
+        strip = self.get_building_strip(self.lighting.shade_alpha[step])
+        bbw = self.buildings.get_width()
+        bbh = self.buildings.get_height()
+        bbx = int((-game.xpos * 0.1 * scale) % bbw - bbw + offset[0] * scale)
+        bby = int((game.horizon + offset[1]) * scale)
+        target.blit(strip, (bbx, bby - bbh))
+
+        target.blit(self.water_texture, (0, (game.horizon + offset[1]) * scale), special_flags=pygame.BLEND_ADD)
+
+        #   The foreground is wider than the screen, so it takes at most two blits
+        fbw = self.foreground.get_width()
+        fbh = self.foreground.get_height()
+        fbx = int((-game.xpos * 0.7 * scale) % fbw - fbw + offset[0] * scale)
+        fby = int((c.GAME_HEIGHT + offset[1] + 30) * scale - fbh)
+        while fbx < self.size[0]:
+            if fbx + fbw > 0:
+                target.blit(self.foreground, (fbx, fby))
+            fbx += fbw
+
+        self.draw_tint(target, step)
+
+        train_spacing = 5 * scale
+        train_width = self.train.get_width()
+        train_start_x = self.size[0]//2 - train_width//2 + offset[0] * scale - train_spacing - train_width
+
+        for number in range(3):
+            xo, yo = game.get_train_offset(number)
+            train_x = int(train_start_x + number * train_spacing + number * train_width + xo * scale)
+            train_y = int((game.floor - 5 + yo + offset[1]) * scale)
+            target.blit(self.train, (train_x, train_y), special_flags=pygame.BLEND_MULT)
@@ -1,46 +1,113 @@
 import pygame
-from primitives import Pose
 import random
 import math
+import numpy as np
+from primitives import PoseBatch
+from assets import assets
 
-class Battery:
+class BatterySwarm:
+    """ Every battery pickup on screen. They're all moved at once as rows of
+        a PoseBatch, collected by mask, and merged into fewer, bigger
+        batteries when a kill chain drops more than merge_threshold of them.
+    """
 
-    def __init__(self, game, capacity, position=(0, 0)):
-        self.surf = pygame.image.load("images/battery.png")
-        self.surf.set_colorkey((0, 0, 0))
-        self.glow = pygame.image.load("images/glow.png")
-        self.position = Pose(position)
+    merge_threshold = 60
+    merge_radius = 40  # batteries in the same cell of this size get merged...
+    merge_age = 0.5  # ...once they've been out long enough to have spread
+
+    def __init__(self, game):
+        self.surf, self.glow = BatterySwarm.load_surfaces()
         self.game = game
-        self.capacity = capacity
+        self.batch = PoseBatch(capacity=128, scalars=("seek_speed", "capacity", "age"))
+
+    @staticmethod
+    def load_surfaces():
+        return assets.image("images/battery.png", colorkey=(0, 0, 0)), assets.image("images/glow.png")
+
+    def __len__(self):
+        return len(self.batch)
 
-        vm = random.random()**2 * 1500
-        va = random.random() * 2*math.pi
-        self.velocity = Pose((math.sin(va) * vm, math.cos(va)*vm))
-        self.seek_speed = 100
+    def clear(self):
+        self.batch.clear()
 
+    def live_positions(self):
+        return self.batch.live_positions()
+
+    def spawn(self, position, count, capacity=1):
+        """ Burst count batteries out of position in random directions """
+        if count <= 0:
+            return
+        vm = np.random.random(count)**2 * 1500
+        va = np.random.random(count) * 2*math.pi
+        velocities = np.column_stack((np.sin(va) * vm, np.cos(va) * vm))
+        self.batch.extend(np.tile(position, (count, 1)), velocities, seek_speed=100, capacity=capacity)
 
     def update(self, dt, events):
-        diff = self.game.player.position - self.position
-        self.position += self.velocity*dt
-        self.velocity *= 0.005**dt
-        self.seek_speed *= 10** dt
-        if diff.magnitude() < 50:
-            self.game.pickups.remove(self)
-            self.game.player.charge += self.capacity
-            if self.game.player.charge > 125:
-                self.game.player.charge = 125
-            if random.random() < 0.2:
-                self.game.pickup_battery.play()
-        diff *= self.seek_speed/diff.magnitude()
-        self.position += diff*dt
-        pass
+        """ Drift every battery and pull it towards the player. Collecting
+            them is left to the game's collision pass.
+        """
+        batch = self.batch
+        if not len(batch):
+            return
+        diff = batch.offsets_to(self.game.player.position.get_position())
+        distance = np.hypot(diff[:, 0], diff[:, 1])
+        batch.integrate(dt)
+        batch.scale_velocities(0.005**dt)
+        seek_speed = batch.scalar("seek_speed")
+        seek_speed *= 10**dt
+        batch.add_positions(diff * (seek_speed * dt / np.maximum(distance, 1e-9))[:, None])
+        batch.scalar("age")[:] += dt
 
-    def draw(self, screen, offset=(0, 0)):
+        if len(batch) > self.merge_threshold:
+            self.merge()
 
-        x = offset[0] - self.glow.get_width()//2 + self.position.x
-        y = offset[1] - self.glow.get_height()//2 + self.position.y
-        screen.blit(self.glow, (x, y), special_flags=pygame.BLEND_ADD)
+    def collect(self, player_indices, indices):
+        """ Hand the batteries at indices over to the player """
+        collected = np.zeros(len(self.batch), dtype=bool)
+        collected[indices] = True
+        player = self.game.player
+        player.charge = min(player.charge + int(self.batch.scalar("capacity")[collected].sum()), 125)
+        self.batch.compact(~collected)
 
-        x = offset[0] - self.surf.get_width()//2 + self.position.x
-        y = offset[1] - self.surf.get_width()//2 + self.position.y
-        screen.blit(self.surf, (x, y), special_flags=pygame.BLEND_ADD)
\ No newline at end of file
+        #   Each battery used to have its own one in five chance to play the sound
+        if random.random() < 1 - 0.8**np.count_nonzero(collected):
+            self.game.pickup_battery.play()
+
+    def merge(self):
+        """ Combine settled batteries sharing a merge_radius cell into one,
+            carrying their summed capacity, at their capacity-weighted center.
+        """
+        batch = self.batch
+        settled = np.flatnonzero(batch.scalar("age") > self.merge_age)
+        cells = np.floor(batch.live_positions()[settled] / self.merge_radius).astype(int)
+        _, first, group = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        group = group.reshape(-1)
+        if len(first) == len(settled):
+            return
+        heads = settled[first]
+
+        capacity = batch.scalar("capacity")
+        weights = capacity[settled]
+        total = np.bincount(group, weights=weights)
+        for array in (batch.live_positions(), batch.live_velocities()):
+            for axis in range(2):
+                array[heads, axis] = np.bincount(group, weights=array[settled, axis] * weights) / total
+        seek_speed = batch.scalar("seek_speed")
+        fastest = np.zeros(len(heads))
+        np.maximum.at(fastest, group, seek_speed[settled])
+        seek_speed[heads] = fastest
+        capacity[heads] = total
+
+        keep = np.ones(len(batch), dtype=bool)
+        keep[settled] = False
+        keep[heads] = True
+        batch.compact(keep)
+
+    def draw(self, screen, offset=(0, 0)):
+        if not len(self.batch):
+            return
+        positions = self.batch.live_positions() + offset
+        glow_corners = (positions - (self.glow.get_width()//2, self.glow.get_height()//2)).tolist()
+        corners = (positions - (self.surf.get_width()//2, self.surf.get_width()//2)).tolist()
+        screen.blits([(self.glow, corner, None, pygame.BLEND_ADD) for corner in glow_corners], doreturn=False)
+        screen.blits([(self.surf, corner, None, pygame.BLEND_ADD) for corner in corners], doreturn=False)
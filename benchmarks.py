@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+""" Rough timings for the game's hot paths. Run with `python benchmarks.py`,
+    optionally passing the names of the benchmarks to run. Set
+    SDL_VIDEODRIVER=dummy to run without opening a window.
+"""
+
+import sys
+import time
+
+import pygame
+
+import constants as c
+from tests.helpers import draw_layers, load_game
+
+
+def timed(func, repeats):
+    """ Return the average time, in seconds, of one call to func. """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def report(name, before, after):
+    print(f"  {name:40} {before*1e6:9.1f}us -> {after*1e6:9.1f}us  ({before/after:5.1f}x)")
+
+
+def bench_blit_formats(screen, repeats=300):
+    """ Blits of images straight from disk vs. converted to the display format """
+    from assets import AssetRegistry
+    registry = AssetRegistry()
+
+    cases = [
+        ("images/bakground.png", None, 0),
+        ("images/background_buildings.png", (255, 255, 255), 0),
+        ("images/foreground_buildings.png", (255, 255, 255), 0),
+        ("images/water.png", None, pygame.BLEND_ADD),
+        ("images/train.png", None, pygame.BLEND_MULT),
+        ("images/sun.png", None, 0),
+        ("images/battery.png", (0, 0, 0), pygame.BLEND_ADD),
+        ("images/kunai_ui.png", None, 0),
+    ]
+    for path, colorkey, flags in cases:
+        raw = pygame.image.load(path)
+        if colorkey is not None:
+            raw.set_colorkey(colorkey)
+        converted = registry.convert(raw)
+        before = timed(lambda: screen.blit(raw, (0, 0), special_flags=flags), repeats)
+        after = timed(lambda: screen.blit(converted, (0, 0), special_flags=flags), repeats)
+        report(path, before, after)
+
+
+def bench_explosion_sprites(screen, repeats=100):
+    """ Explosion debris and flashes drawn per frame vs. from pre-rendered sprites """
+    from emitter import SparkEmitter
+    from particle import BigBoom
+
+    sparks = SparkEmitter()
+    for _ in range(10):
+        sparks.boom((640, 360), count=40)
+        sparks.laser_boom((640, 360), count=50, duration=1)
+    sparks.update(0.2)
+    SparkEmitter.load_circles()
+
+    def draw_circles():
+        live = slice(0, sparks.count)
+        scales = sparks.size[live] * (1 - sparks.age[live] / sparks.duration[live])**sparks.falloff[live]
+        for (x, y), radius in zip(sparks.position[live].tolist(), scales.tolist()):
+            pygame.draw.circle(screen, (255, 255, 255), (x, y), radius)
+
+    before = timed(draw_circles, repeats)
+    after = timed(lambda: sparks.draw(screen), repeats)
+    report(f"{len(sparks)} debris circles", before, after)
+
+    BigBoom.load_frames()
+    boom = BigBoom((640, 360))
+    boom.update(0.1, [])
+    source = pygame.Surface((400, 400))
+    source.fill((0, 0, 0))
+    pygame.draw.ellipse(source, (255, 255, 255), source.get_rect())
+    source.set_colorkey((0, 0, 0))
+
+    def draw_scaled():
+        size = int(400 * boom.scale)
+        scaled = pygame.transform.scale(source, (size, size))
+        scaled.set_alpha(boom.alpha)
+        screen.blit(scaled, (640 - size//2, 360 - size//2))
+
+    before = timed(draw_scaled, repeats)
+    after = timed(lambda: boom.draw(screen), repeats)
+    report("BigBoom flash", before, after)
+
+
+def bench_pose_ops(screen, repeats=200000):
+    """ Integrating a Pose by copying vs. in place """
+    from primitives import Pose
+
+    position = Pose((0, 0))
+    velocity = Pose((3, 4))
+    dt = 1/90
+
+    def copying():
+        nonlocal position
+        position = position + velocity * dt
+
+    def in_place():
+        position.add_pose(velocity, weight=dt)
+
+    report("p = p + v*dt -> p.add_pose(v, weight=dt)", timed(copying, repeats), timed(in_place, repeats))
+
+    def augmented():
+        nonlocal position
+        position += velocity * dt
+
+    report("p = p + v*dt -> p += v*dt", timed(copying, repeats), timed(augmented, repeats))
+    report("distance_to -> distance_squared_to",
+           timed(lambda: position.distance_to(velocity), repeats),
+           timed(lambda: position.distance_squared_to(velocity), repeats))
+
+
+def bench_pose_batch(screen, repeats=2000):
+    """ Moving 200 pickups one Pose at a time vs. as one PoseBatch """
+    from primitives import Pose, PoseBatch
+
+    poses = [(Pose((i, i)), Pose((3, 4))) for i in range(200)]
+    batch = PoseBatch()
+    for i in range(200):
+        batch.add((i, i), (3, 4))
+    dt = 1/90
+
+    def one_at_a_time():
+        for position, velocity in poses:
+            position.add_pose(velocity, weight=dt)
+            velocity *= 0.005**dt
+
+    def batched():
+        batch.integrate(dt)
+        batch.scale_velocities(0.005**dt)
+
+    report("200 poses integrated and damped", timed(one_at_a_time, repeats), timed(batched, repeats))
+
+
+def bench_projectile_broadphase(screen, repeats=200):
+    """ 40 enemies checking 60 kunai each vs. through a spatial hash """
+    import random
+    from primitives import Pose
+    from spatial import SpatialHash
+
+    class Body:
+        def __init__(self):
+            self.position = Pose((random.random() * c.WINDOW_WIDTH, random.random() * c.WINDOW_HEIGHT))
+
+    random.seed(0)
+    enemies = [Body() for _ in range(40)]
+    projectiles = [Body() for _ in range(60)]
+    grid = SpatialHash(cell_size=128)
+
+    def brute_force():
+        for enemy in enemies:
+            for projectile in projectiles:
+                (projectile.position - enemy.position).magnitude() < 55
+
+    def hashed():
+        grid.rebuild(projectiles)
+        for enemy in enemies:
+            for projectile in grid.query(enemy.position.x, enemy.position.y, 55):
+                projectile.position.distance_squared_to(enemy.position) < 55**2
+
+    report("projectile vs. enemy checks", timed(brute_force, repeats), timed(hashed, repeats))
+
+
+def bench_spawn_timeline(screen, repeats=3):
+    """ Ticking the spawn timeline through a dense ten minute stress wave """
+    from enemy import EnemyRegistry, Scuttle
+    from waves import SpawnTimeline, Wave, RANDOM
+
+    class Stress:
+        xpos = start_pos = 0
+        enemies = EnemyRegistry()
+        spawned = 0
+
+        def get_multiplier(self):
+            return 1 + self.xpos / 42000
+
+        def spawn_scuttle(self, left):
+            self.spawned += 1
+
+    dt = 1/90
+    ticks = int(600 / dt)
+    waves = [Wave(Scuttle, side=RANDOM, start=0, every=0.02) for _ in range(5)]
+    spawns_per_tick = []
+
+    def run():
+        game = Stress()
+        timeline = SpawnTimeline(waves, seed=0)
+        for _ in range(ticks):
+            game.xpos += 500 * dt
+            timeline.update(game, dt)
+        spawns_per_tick.append(game.spawned / ticks)
+
+    per_tick = timed(run, repeats) / ticks
+    print(f"  {ticks} ticks, {spawns_per_tick[-1]:.1f} spawns per tick: {per_tick*1e6:.1f}us per tick")
+
+
+def bench_background(screen, repeats=300):
+    """ Every background layer drawn every frame vs. BackgroundCompositor, shaking and still """
+    game = load_game(screen)
+    game.day = 0.6
+    tint = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    lightener = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    lightener.fill((255, 255, 255))
+    lightener.set_alpha(30)
+
+    def draw(func, offset):
+        game.xpos += 5
+        func(screen, offset)
+
+    for colorblind in (False, True):
+        game.colorblind_mode = colorblind
+        mode = "colorblind" if colorblind else "normal"
+        layers = timed(lambda: draw(lambda surf, offset: draw_layers(game, surf, tint, lightener, offset), (0, 0)), repeats)
+        report(f"draw_background, {mode}, shaking", layers, timed(lambda: draw(game.draw_background, (3, 2)), repeats))
+        report(f"draw_background, {mode}, still", layers, timed(lambda: draw(game.draw_background, (0, 0)), repeats))
+
+
+def bench_building_layers(screen, repeats=300):
+    """ Building layers blitted tile by tile vs. from pre-tiled, run-length encoded strips """
+    game = load_game(screen)
+    compositor = game.background_compositor
+    step = compositor.lighting.step(game.day)
+    strip = compositor.get_building_strip(compositor.lighting.shade_alpha[step])
+    buildings, reflection = game.background_buildings, game.bb_reflection
+    bbw, bbh = buildings.get_size()
+    y = int(game.horizon)
+
+    def tiles():
+        for x in range(-bbw//2, c.WINDOW_WIDTH, bbw):
+            screen.blit(buildings, (x, y - bbh))
+            screen.blit(reflection, (x, y))
+        screen.blit(game.foreground_buildings, (-500, 50))
+
+    def strips():
+        screen.blit(strip, (-bbw//2, y - bbh))
+        screen.blit(compositor.foreground, (-500, 50))
+
+    report("background + foreground buildings", timed(tiles, repeats), timed(strips, repeats))
+
+
+def bench_render_scale(screen, repeats=300):
+    """ A busy frame of the world drawn at full resolution vs. at half and scaled up """
+    from background import BackgroundCompositor
+    from particle import BigBoom
+    from render import RenderTarget
+    game = load_game(screen)
+    game.day = 0.6
+    game.shade_alpha = 0
+    for left in (True, False):
+        game.spawn_orb(left)
+        game.spawn_scuttle(left)
+    for x in range(200, 1200, 200):
+        game.batteries.spawn((x, 400), 10)
+        game.sparks.boom((x, 300), count=20)
+        game.add_particle(BigBoom, (x, 300))
+    game.batteries.update(0.2, [])
+    game.sparks.update(0.2)
+    for particle in game.particles:
+        particle.update(0.1, [])
+
+    def draw(world):
+        game.xpos += 5
+        game.draw_world(world)
+        if world is not screen:
+            world.present(screen)
+
+    full = timed(lambda: draw(screen), repeats)
+    game.world = RenderTarget((c.GAME_WIDTH, c.GAME_HEIGHT), 0.5)
+    game.background_compositor = BackgroundCompositor(game, scale=0.5)
+    report("world at render scale 1 -> 0.5", full, timed(lambda: draw(game.world), repeats))
+
+
+BENCHMARKS = [
+    bench_blit_formats,
+    bench_explosion_sprites,
+    bench_pose_ops,
+    bench_pose_batch,
+    bench_projectile_broadphase,
+    bench_spawn_timeline,
+    bench_background,
+    bench_building_layers,
+    bench_render_scale,
+]
+
+
+if __name__ == '__main__':
+    pygame.init()
+    screen = pygame.display.set_mode((c.WINDOW_WIDTH, c.WINDOW_HEIGHT))
+    names = sys.argv[1:]
+    for bench in BENCHMARKS:
+        if names and bench.__name__ not in names:
+            continue
+        print(f"{bench.__name__}: {bench.__doc__.strip()}")
+        bench(screen)
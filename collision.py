@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class CollisionWorld:
+    """ Overlap tests between named layers of bodies. Each layer hands over
+        its bodies and their positions once per resolve(); every rule then
+        finds its overlapping pairs with one NumPy pass and calls back with
+        each pair, so nothing has to loop over the other layer itself.
+    """
+
+    def __init__(self):
+        self.layers = {}
+        self.rules = []
+
+    def add_layer(self, name, source):
+        """ name: what rules call the layer
+            source: function returning (bodies, positions) for this frame,
+                with one (x, y) position per body
+        """
+        self.layers[name] = source
+
+    def on_overlap(self, first, second, radius, callback, batched=False):
+        """ Call callback(first_body, second_body) for every pair from the
+            two layers whose centers are closer than radius. If batched, call
+            callback(first_indices, second_indices) once instead, with index
+            arrays into the layers, whenever anything overlaps.
+        """
+        self.rules.append((first, second, radius, callback, batched))
+
+    def gather(self, name):
+        bodies, positions = self.layers[name]()
+        return bodies, np.array(positions, dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def overlapping(first_positions, second_positions, radius):
+        """ Return an array of (i, j) index pairs of positions closer than radius. """
+        if not len(first_positions) or not len(second_positions):
+            return np.zeros((0, 2), dtype=int)
+        offsets = first_positions[:, None, :] - second_positions[None, :, :]
+        distances_squared = np.einsum("ijk,ijk->ij", offsets, offsets)
+        return np.argwhere(distances_squared < radius**2)
+
+    def resolve(self):
+        """ Run every rule. Layers are gathered once, before any callback
+            runs, so callbacks may add or remove bodies freely.
+        """
+        gathered = {name: self.gather(name) for name in self.layers}
+        for first, second, radius, callback, batched in self.rules:
+            first_bodies, first_positions = gathered[first]
+            second_bodies, second_positions = gathered[second]
+            pairs = self.overlapping(first_positions, second_positions, radius)
+            if batched:
+                if len(pairs):
+                    callback(pairs[:, 0], pairs[:, 1])
+                continue
+            for i, j in pairs.tolist():
+                callback(first_bodies[i], second_bodies[j])
@@ -2,4 +2,8 @@ GAME_WIDTH = 1280
 GAME_HEIGHT = 720
 
 WINDOW_WIDTH = 1280
-WINDOW_HEIGHT = 720
\ No newline at end of file
+WINDOW_HEIGHT = 720
+
+#   Fraction of the window's resolution the world is drawn at before being
+#   scaled up to fill it. Lower is faster but blurrier.
+RENDER_SCALE = 1
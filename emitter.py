@@ -0,0 +1,196 @@
+import math
+
+import numpy as np
+import pygame
+
+from render import draw_polygon
+
+
+class SparkEmitter:
+    """ Keeps every short-lived spark (kunai hits, explosion debris, laser
+        debris) in one set of NumPy arrays, so they are moved, aged and culled
+        with a handful of array operations per frame instead of one Python
+        object each.
+    """
+
+    #   Shapes
+    SHARD = 0
+    CIRCLE = 1
+
+    #   Outline of a shard, pointing right, before it is scaled and rotated
+    shard_corners = [[3, 0], [0, -0.5], [-1, 0], [0, 0.5]]
+
+    #   Pre-rendered circles, by color, indexed by whole-pixel radius
+    circle_sprites = {}
+    max_radius = 25
+
+    def __init__(self, capacity=512):
+        self.count = 0
+        self.allocate(capacity)
+
+        corners = np.array(self.shard_corners, dtype=float)
+        self.corner_angles = np.arctan2(corners[:, 1], corners[:, 0])
+        self.corner_magnitudes = np.hypot(corners[:, 0], corners[:, 1])
+
+    def allocate(self, capacity):
+        """ Make room for capacity sparks, keeping the live ones. """
+        old = self.arrays() if self.count else None
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.drag = np.ones((capacity, 2))  # velocity kept per second, per axis
+        self.pull = np.zeros(capacity)  # x acceleration...
+        self.pull_limit = np.zeros(capacity)  # ...applied while x velocity is above this
+        self.age = np.zeros(capacity)
+        self.duration = np.ones(capacity)
+        self.shape = np.zeros(capacity, dtype=np.int8)
+        self.size = np.zeros(capacity)
+        self.falloff = np.ones(capacity)  # size is scaled by (1 - through)**falloff
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        if old:
+            for array, values in zip(self.arrays(), old):
+                array[:self.count] = values[:self.count]
+
+    def arrays(self):
+        return [self.position, self.velocity, self.drag, self.pull, self.pull_limit, self.age,
+                self.duration, self.shape, self.size, self.falloff, self.color]
+
+    @staticmethod
+    def load_circles(color=(255, 255, 255)):
+        """ Render a circle of every radius up to max_radius in color. Each
+            one lines up with pygame.draw.circle when blitted at its center
+            less radius + 1.
+        """
+        sprites = [None]
+        for radius in range(1, SparkEmitter.max_radius + 1):
+            sprite = pygame.Surface((2*radius + 2, 2*radius + 2))
+            key_color = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+            sprite.fill(key_color)
+            sprite.set_colorkey(key_color, pygame.RLEACCEL)
+            pygame.draw.circle(sprite, color, (radius + 1, radius + 1), radius)
+            sprites.append(sprite)
+        SparkEmitter.circle_sprites[tuple(color)] = sprites
+        return sprites
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count, position, velocity, age, duration, shape, size, falloff=1,
+            drag=(1, 1), pull=0, pull_limit=0, color=(255, 255, 255)):
+        """ Append count sparks. position is shared; velocity and age are
+            arrays with one entry per spark.
+        """
+        if self.count + count > self.capacity:
+            self.allocate(max(self.capacity * 2, self.count + count))
+        new = slice(self.count, self.count + count)
+        self.position[new] = position
+        self.velocity[new] = velocity
+        self.drag[new] = drag
+        self.pull[new] = pull
+        self.pull_limit[new] = pull_limit
+        self.age[new] = age
+        self.duration[new] = duration
+        self.shape[new] = shape
+        self.size[new] = size
+        self.falloff[new] = falloff
+        self.color[new] = color
+        self.count += count
+
+    def random_velocities(self, count, magnitudes, velocity=None, spread=4):
+        """ Velocities of the given magnitudes, in random directions, or
+            scattered around velocity if one is given.
+        """
+        if velocity is None:
+            angles = np.random.random(count) * 2 * math.pi
+        else:
+            signs = np.random.choice((-1, 1), count)
+            angles = math.atan2(velocity[0], velocity[1]) + signs * np.random.random(count)**spread * math.pi / 2
+        return np.column_stack((np.sin(angles) * magnitudes, np.cos(angles) * magnitudes))
+
+    def kunai_hit(self, position, velocity=None, count=1, duration=0.3, color=(255, 255, 255)):
+        """ Shards thrown off by a kunai hitting something """
+        magnitudes = np.random.random(count)**2 * 700 + 300
+        velocities = self.random_velocities(count, magnitudes, velocity)
+        ages = np.random.random(count) * 0.3
+        self.add(count, position, velocities, ages, duration, self.SHARD, 15,
+                 drag=(0.005, 0.005), color=color)
+
+    def boom(self, position, count=1, duration=1.5):
+        """ Debris from an exploding enemy, blown backwards by the wind """
+        magnitudes = np.random.random(count)**4 * 700
+        velocities = self.random_velocities(count, magnitudes)
+        ages = np.random.random(count) * 1
+        self.add(count, position, velocities, ages, duration, self.CIRCLE, 20,
+                 drag=(1, 0.1), pull=-1200, pull_limit=-500)
+
+    def laser_boom(self, position, direction=(1, 0), count=1, duration=1.5):
+        """ Debris blasted out of an orb in the direction it fires """
+        magnitudes = np.random.random(count)**2 * 800
+        velocities = self.random_velocities(count, magnitudes)
+        velocities[:, 0] = np.abs(velocities[:, 0]) * (1 + np.random.random(count) * 500 / (np.abs(velocities[:, 1]) + 1))
+        if direction[0] < 1:
+            velocities[:, 0] *= -1
+        ages = np.random.random(count) * 0.25
+        self.add(count, position, velocities, ages, duration, self.CIRCLE, 25, falloff=2,
+                 drag=(0.01, 0.01))
+
+    def update(self, dt, events=None):
+        if not self.count:
+            return
+        live = slice(0, self.count)
+        self.position[live] += self.velocity[live] * dt
+        self.age[live] += dt
+
+        #   Drop sparks that have run out, keeping the rest packed at the front
+        alive = self.age[live] <= self.duration[live]
+        if not alive.all():
+            for array in self.arrays():
+                kept = array[live][alive]
+                array[:len(kept)] = kept
+            self.count = int(np.count_nonzero(alive))
+            live = slice(0, self.count)
+
+        velocity = self.velocity[live]
+        pulled = velocity[:, 0] > self.pull_limit[live]
+        velocity[:, 0] += np.where(pulled, self.pull[live] * dt, 0)
+        velocity *= self.drag[live]**dt
+
+    def draw(self, surf, offset=(0, 0)):
+        if not self.count:
+            return
+        live = slice(0, self.count)
+        through = self.age[live] / self.duration[live]
+        scales = self.size[live] * (1 - through)**self.falloff[live]
+
+        #   Shards have never followed the screen shake
+        shards = np.flatnonzero(self.shape[live] == self.SHARD)
+        if len(shards):
+            velocity = self.velocity[shards]
+            angles = np.arctan2(velocity[:, 1], velocity[:, 0])[:, None] - self.corner_angles
+            magnitudes = scales[shards, None] * self.corner_magnitudes
+            xs = np.cos(angles) * magnitudes + self.position[shards, 0:1]
+            ys = np.sin(angles) * magnitudes + self.position[shards, 1:2]
+            corners = np.stack((xs, ys), axis=2).tolist()
+            for color, points in zip(self.color[shards].tolist(), corners):
+                draw_polygon(surf, color, points)
+
+        circles = np.flatnonzero(self.shape[live] == self.CIRCLE)
+        radii = np.minimum(scales[circles], self.max_radius).astype(int)
+        circles = circles[radii >= 1]
+        radii = radii[radii >= 1]
+        if len(circles):
+            corners = (self.position[circles] + offset).astype(int) - radii[:, None] - 1
+            circle_colors = self.color[circles]
+            if (circle_colors == circle_colors[0]).all():
+                palette = circle_colors[:1]
+            else:
+                palette = np.unique(circle_colors, axis=0)
+            for color in palette:
+                same = (circle_colors == color).all(axis=1)
+                color = tuple(color.tolist())
+                sprites = self.circle_sprites.get(color) or self.load_circles(color)
+                surf.blits(zip(map(sprites.__getitem__, radii[same].tolist()), corners[same].tolist()),
+                           doreturn=False)
@@ -1,8 +1,50 @@
-from battery import Battery
 from primitives import GameObject, Pose
-from sprite import Sprite, SpriteSheet
-from particle import BoomParticle, BigBoom, Laser, LaserBoomParticle, LaserGuide
+from sprite import Sprite
+from particle import BigBoom, Laser, LaserGuide
 import constants as c
+from assets import assets
+from entities import EntityList
+
+
+class EnemyRegistry(EntityList):
+    """ The game's enemies, with a running count of each type from each
+        side, so spawners can ask what's on screen without scanning it.
+        Counts follow iteration: removed enemies stop counting right away.
+    """
+
+    #   Sides, by where the enemy came on from
+    LEFT = 0
+    RIGHT = 1
+
+    def __init__(self, items=()):
+        self.counts = {}
+        #   Enemies overlap, so keep them in spawn order to keep which one is on top
+        super().__init__(items, ordered=True)
+
+    @staticmethod
+    def side(enemy):
+        return EnemyRegistry.RIGHT if enemy.direction.x < 0 else EnemyRegistry.LEFT
+
+    def add(self, enemy):
+        key = (type(enemy), self.side(enemy))
+        self.counts[key] = self.counts.get(key, 0) + 1
+        return super().add(enemy)
+
+    def remove(self, enemy):
+        if enemy in self:
+            key = (type(enemy), self.side(enemy))
+            self.counts[key] -= 1
+        super().remove(enemy)
+
+    def clear(self):
+        super().clear()
+        self.counts = {}
+
+    def count(self, cls, side=None):
+        """ Number of enemies of exactly class cls, from one side or both """
+        if side is None:
+            return self.counts.get((cls, self.LEFT), 0) + self.counts.get((cls, self.RIGHT), 0)
+        return self.counts.get((cls, side), 0)
 
 
 class Enemy(GameObject):
@@ -22,11 +64,12 @@ class Enemy(GameObject):
         self.silent = False
 
     def update(self, dt, events):
-        self.recoil_position += self.velocity * dt
+        self.recoil_position.add_pose(self.velocity, weight=dt)
         self.velocity *= 0.0005**dt
         self.recoil_position *= 0.002**dt
 
-        for projectile in self.game.player.projectiles[:]:
+        center = self.position + self.recoil_position
+        for projectile in self.game.projectile_grid.query(center.x, center.y, self.radius + 5):
             if self.destroyed:
                 break
             if self.collides_with_projectile(projectile):
@@ -60,13 +103,11 @@ class Enemy(GameObject):
             projectile.stuck = False
             projectile.gravity = True
 
-        for i in range(40):
-            self.game.particles.append(BoomParticle(self.position.get_position()))
-        self.game.particles.append(BigBoom(self.position.get_position()))
+        self.game.sparks.boom(self.position.get_position(), count=40)
+        self.game.add_particle(BigBoom, self.position.get_position())
         self.game.shake(amt=20)
 
-        for i in range(int(self.reward / self.game.get_multiplier())):
-            self.game.pickups.append(Battery(self.game, 1, self.position.get_position()))
+        self.game.batteries.spawn(self.position.get_position(), int(self.reward / self.game.get_multiplier()))
 
 
 
@@ -89,20 +130,8 @@ class Orb(Enemy):
         super().__init__(game, position)
 
         self.direction = Pose(direction)
-        reversed = self.direction.x < 0
-        idle = SpriteSheet("images/enemy_closed.png", (1, 1), 1, xflip=reversed)
-        opening = SpriteSheet("images/enemy_open.png", (5, 1), 5, xflip=reversed, repeat=False)
-        open = SpriteSheet("images/enemy_opened.png", (1, 1), 1, xflip=reversed)
-        closing = SpriteSheet("images/enemy_open.png", (5, 1), 5, xflip=reversed, reversed=True, repeat=False)
         self.sprite = Sprite(12)
-        self.sprite.add_animation(
-            {
-                "idle": idle,
-                "opening": opening,
-                "open": open,
-                "closing": closing,
-            }
-        )
+        self.sprite.add_animation(Orb.load_animations(self.direction.x < 0))
         self.sprite.start_animation("idle")
 
         self.since_laser = 0
@@ -111,6 +140,14 @@ class Orb(Enemy):
         self.cooldown = 2.5
         self.has_closed = False
 
+    @staticmethod
+    def load_animations(reversed):
+        return {
+            "idle": assets.sprite_sheet("images/enemy_closed.png", (1, 1), 1, xflip=reversed),
+            "opening": assets.sprite_sheet("images/enemy_open.png", (5, 1), 5, xflip=reversed, repeat=False),
+            "open": assets.sprite_sheet("images/enemy_opened.png", (1, 1), 1, xflip=reversed),
+            "closing": assets.sprite_sheet("images/enemy_open.png", (5, 1), 5, xflip=reversed, reversed=True, repeat=False),
+        }
 
     def get_target_position(self):
         y = self.game.player.position.y
@@ -130,7 +167,7 @@ class Orb(Enemy):
         if diff.magnitude() >= 5 and not self.locked_on and not self.destroyed:
             if diff.magnitude() > 500:
                 diff *= 500/diff.magnitude()
-            self.position += diff*dt*2
+            self.position.add_pose(diff, weight=dt*2)
         elif not self.locked_on and self.since_laser > self.cooldown:
             if self.direction.x > 0 and self.game.player.position.x > self.position.x and not self.destroyed:
                 self.lock_on()
@@ -158,7 +195,7 @@ class Orb(Enemy):
         self.since_lockon = 0
         self.sprite.start_animation("opening")
         self.has_closed = False
-        self.game.particles.append(LaserGuide(self.position.get_position(), self.direction.get_position()))
+        self.game.add_particle(LaserGuide, self.position.get_position(), self.direction.get_position())
 
 
 
@@ -170,9 +207,8 @@ class Orb(Enemy):
             self.velocity.x -= 1500
         else:
             self.velocity.x += 1500
-        self.game.particles.append(Laser(self.position.get_position(), self.direction.get_position()))
-        for i in range(50):
-            self.game.particles.append(LaserBoomParticle(self.position.get_position(), direction=self.direction.get_position(), duration=1))
+        self.game.add_particle(Laser, self.position.get_position(), self.direction.get_position())
+        self.game.sparks.laser_boom(self.position.get_position(), direction=self.direction.get_position(), count=50, duration=1)
 
         player = self.game.player
         if (player.position.x - self.position.x) * self.direction.x > 0 and abs(player.position.y - self.position.y) < 80:
@@ -195,7 +231,7 @@ class Orb(Enemy):
         if projectile.stuck or projectile.pickup:
             return False
         diff = projectile.position - self.position - self.recoil_position
-        if diff.magnitude() < self.radius + 5:
+        if diff.magnitude_squared() < (self.radius + 5)**2:
             return True
 
     def clean_up(self):
@@ -211,13 +247,15 @@ class Scuttle(Enemy):
         self.sprite = Sprite(12)
         if self.direction.x < 0:
             self.velocity = Pose((-800, 0))
-            idle = SpriteSheet("images/scuttle_left.png", (8, 1), 8)
         else:
             self.velocity = Pose((800, 0))
-            idle = SpriteSheet("images/scuttle_left.png", (8, 1), 8, reversed=True)
-        self.sprite.add_animation({"idle": idle})
+        self.sprite.add_animation(Scuttle.load_animations(self.direction.x >= 0))
         self.sprite.start_animation("idle")
 
+    @staticmethod
+    def load_animations(reversed):
+        return {"idle": assets.sprite_sheet("images/scuttle_left.png", (8, 1), 8, reversed=reversed)}
+
     def update(self, dt, events):
         if self.game.rewinding:
             dt *= 0.1
@@ -227,7 +265,7 @@ class Scuttle(Enemy):
                 self.position += Pose((-400, 0))*dt
             else:
                 self.position += Pose((400, 0))*dt
-        self.position += self.velocity*dt
+        self.position.add_pose(self.velocity, weight=dt)
         self.sprite.update(dt)
         if self.recoil_position.y > 0:
             self.recoil_position.y = 0
@@ -240,7 +278,7 @@ class Scuttle(Enemy):
         if projectile.stuck or projectile.pickup:
             return False
         diff = projectile.position - self.position - self.recoil_position
-        if diff.magnitude() < self.radius + 5:
+        if diff.magnitude_squared() < (self.radius + 5)**2:
             return True
 
     def destroy(self, silent=False):
@@ -0,0 +1,77 @@
+from itertools import islice
+
+
+class EntityList:
+    """ Collection of game objects with O(1) removal. Each entity is its own
+        handle: the list keeps track of which slot it is in, so removing it
+        just moves the last entity into that slot.
+
+        That reorders the list, which changes what is drawn on top of what.
+        Collections drawn in the order things were added, like particles,
+        should pass ordered=True; flush() then closes the gaps instead, in
+        one pass over the list.
+
+        Removal is deferred. remove() only marks an entity, which is then
+        skipped by iteration, len() and membership tests until flush() takes
+        it out, so it's safe to remove things while iterating.
+    """
+
+    def __init__(self, items=(), ordered=False):
+        self.ordered = ordered
+        self.items = []
+        self.slots = {}  # entity -> index into items
+        self.removed = set()
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        self.slots[item] = len(self.items)
+        self.items.append(item)
+        return item
+
+    def remove(self, item):
+        """ Mark item to be taken out at the next flush(). Removing something
+            twice, or something not in the list, does nothing.
+        """
+        if item in self.slots:
+            self.removed.add(item)
+
+    def flush(self):
+        """ Take out everything removed since the last flush, and return it. """
+        if not self.removed:
+            return []
+        removed = list(self.removed)
+        if self.ordered:
+            self.items = [item for item in self.items if item not in self.removed]
+            self.slots = {item: index for index, item in enumerate(self.items)}
+            self.removed.clear()
+            return removed
+        for item in removed:
+            index = self.slots.pop(item)
+            last = self.items.pop()
+            if last is not item:
+                self.items[index] = last
+                self.slots[last] = index
+        self.removed.clear()
+        return removed
+
+    def clear(self):
+        self.items = []
+        self.slots = {}
+        self.removed = set()
+
+    def __iter__(self):
+        #   Things added while iterating wait until the next pass
+        live = islice(self.items, len(self.items))
+        if not self.removed:
+            return live
+        return (item for item in live if item not in self.removed)
+
+    def __len__(self):
+        return len(self.items) - len(self.removed)
+
+    def __contains__(self, item):
+        return item in self.slots and item not in self.removed
+
+    def __bool__(self):
+        return len(self) > 0
@@ -1,12 +1,25 @@
 import pygame
 import constants as c
 import sys
+import os
 import math
 from player import Player
 from primitives import Pose
-from particle import RewindParticle, SunExplosion, SunTint, WarningParticle, BigBoom, SunExplosionLong
-from enemy import Orb, Scuttle
+from particle import RewindSwarm, SunExplosion, SunTint, WarningParticle, BigBoom, SunExplosionLong, Laser, LaserGuide
+from enemy import Orb, Scuttle, EnemyRegistry
+from battery import BatterySwarm
+from projectile import Kunai
+from emitter import SparkEmitter
+from pool import ParticlePool
+from spatial import SpatialHash
+from collision import CollisionWorld
+from entities import EntityList
+from waves import SpawnTimeline, WAVES
+from overlay import OverlayManager
+from background import BackgroundCompositor
+from render import RenderTarget
 from Button import Button
+from assets import assets
 
 import random
 
@@ -24,8 +37,13 @@ class Game:
         self.config_menu()
         self.last_distance = None
 
+        # Read and decode everything else while the intro and directions are showing
+        assets.preload(self.asset_files())
         self.intro()
         self.directions()
+        assets.wait()
+        self.load_assets()
+        assets.discard_preloaded()
 
         while True:
 
@@ -49,28 +67,44 @@ class Game:
 
             self.update_display()
 
-        back = pygame.image.load("images/win.png")
+        back = assets.image("images/win.png")
         age = 0
         alpha = 255
         should_Break = False
-        etc = pygame.image.load("images/etc_light.png")
+        etc = assets.image("images/etc_light.png")
+        etc_rect = etc.get_rect(midbottom=(c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT))
+        etc_shown = None
         while not should_Break:
             events, dt = self.get_events()
             age += dt
-            self.screen.blit(back, (0, 0))
-            if age > 3 and age%1 < 0.7:
-                self.screen.blit(etc, (c.WINDOW_WIDTH//2 - etc.get_width()//2, c.WINDOW_HEIGHT - etc.get_height()))
+            shown = age > 3 and age%1 < 0.7
 
             for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         should_Break = True
 
-            shade.set_alpha(alpha)
-            self.screen.blit(shade, (0, 0))
+            if alpha > 0 or etc_shown is None:
+                #   Fading in, or the first frame after, so the whole screen changes
+                self.screen.blit(back, (0, 0))
+                if shown:
+                    self.screen.blit(etc, etc_rect)
+                if alpha > 0:
+                    shade.set_alpha(alpha)
+                    self.screen.blit(shade, (0, 0))
+                else:
+                    etc_shown = shown
+                self.update_display()
+            elif shown != etc_shown:
+                #   Otherwise only the blinking prompt changes
+                self.screen.blit(back, etc_rect, etc_rect)
+                if shown:
+                    self.screen.blit(etc, etc_rect)
+                etc_shown = shown
+                self.update_display([etc_rect])
+            else:
+                self.update_display([])
             alpha -= 255 * dt
-
-            self.update_display()
         alpha = 0
         age = 0
 
@@ -93,28 +127,44 @@ class Game:
     def directions(self):
         shade = pygame.Surface((c.WINDOW_WIDTH, c.WINDOW_HEIGHT))
         shade.fill((0, 0, 0))
-        back = pygame.image.load("images/instructions.png")
+        back = assets.image("images/instructions.png")
         age = 0
         alpha = 255
         should_Break = False
-        etc = pygame.image.load("images/enter_to_continue.png")
+        etc = assets.image("images/enter_to_continue.png")
+        etc_rect = etc.get_rect(midbottom=(c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT))
+        etc_shown = None
         while not should_Break:
             events, dt = self.get_events()
             age += dt
-            self.screen.blit(back, (0, 0))
-            if age > 3 and age%1 < 0.7:
-                self.screen.blit(etc, (c.WINDOW_WIDTH//2 - etc.get_width()//2, c.WINDOW_HEIGHT - etc.get_height()))
+            shown = age > 3 and age%1 < 0.7
 
             for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         should_Break = True
 
-            shade.set_alpha(alpha)
-            self.screen.blit(shade, (0, 0))
+            if alpha > 0 or etc_shown is None:
+                #   Fading in, or the first frame after, so the whole screen changes
+                self.screen.blit(back, (0, 0))
+                if shown:
+                    self.screen.blit(etc, etc_rect)
+                if alpha > 0:
+                    shade.set_alpha(alpha)
+                    self.screen.blit(shade, (0, 0))
+                else:
+                    etc_shown = shown
+                self.update_display()
+            elif shown != etc_shown:
+                #   Otherwise only the blinking prompt changes
+                self.screen.blit(back, etc_rect, etc_rect)
+                if shown:
+                    self.screen.blit(etc, etc_rect)
+                etc_shown = shown
+                self.update_display([etc_rect])
+            else:
+                self.update_display([])
             alpha -= 255 * dt
-
-            self.update_display()
         alpha = 0
         age = 0
 
@@ -147,7 +197,7 @@ class Game:
             255 +3500,
         ]
         sections[1] = pygame.transform.scale(sections[1], (c.WINDOW_WIDTH, c.WINDOW_HEIGHT//4))
-        back = pygame.image.load("images/intro.png")
+        back = assets.image("images/intro.png")
         while True:
             events, dt = self.get_events()
             age += dt
@@ -187,48 +237,71 @@ class Game:
         width = 400
         height = 240
         fullscreen_button = Button(
-            pygame.image.load("images/fullscreen_enabled.png"),
+            assets.image("images/fullscreen_enabled.png"),
             pos=(width//2 + 92, height - 100),
-            disabled_surf=pygame.image.load("images/fullscreen_disabled.png"),
+            disabled_surf=assets.image("images/fullscreen_disabled.png"),
             enabled=False,
             pulse=0,
             on_click=self.toggle_fullscreen_mode,
         )
         colorblind_button = Button(
-            pygame.image.load("images/contrast_enabled.png"),
+            assets.image("images/contrast_enabled.png"),
             pos=(width//2 - 92, height - 100),
-            disabled_surf=pygame.image.load("images/contrast_disabled.png"),
+            disabled_surf=assets.image("images/contrast_disabled.png"),
             enabled=False,
             pulse=0,
             on_click=self.toggle_colorblind_mode,
         )
         start_button = Button(
-            pygame.image.load("images/start_button.png"),
+            assets.image("images/start_button.png"),
             pos=(width//2, height - 170),
             on_click=self.start,
             pulse=0,
         )
+        buttons = [fullscreen_button, colorblind_button, start_button]
+        drawn = {}  # button -> (look, rect) as last drawn
+        first_frame = True
+        self.screen.fill((0, 0, 0))
         while not self.started:
             events, dt = self.get_events()
-            self.screen.fill((0, 0, 0))
             colorblind_button.update(dt, events)
             fullscreen_button.update(dt, events)
             start_button.update(dt, events)
             fullscreen_button.enabled = self.fullscreen
             colorblind_button.enabled = self.colorblind_mode
-            fullscreen_button.draw(self.screen)
-            colorblind_button.draw(self.screen)
-            start_button.draw(self.screen)
-            self.update_display()
+
+            #   Only buttons that look different from last frame get redrawn and presented
+            changed = [button for button in buttons if drawn.get(button, (None,))[0] != button.get_look()]
+            dirty = []
+            for button in changed:
+                if button in drawn:
+                    self.screen.fill((0, 0, 0), drawn[button][1])
+                    dirty.append(drawn[button][1])
+            for button in buttons:
+                if button in changed or any(drawn[button][1].colliderect(rect) for rect in dirty):
+                    rect = button.draw(self.screen)
+                    drawn[button] = (button.get_look(), rect)
+                    dirty.append(rect)
+            self.update_display(None if first_frame else dirty)
+            first_frame = False
 
         if self.fullscreen:
             self.screen = pygame.display.set_mode((c.WINDOW_WIDTH, c.WINDOW_HEIGHT), flags=pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((c.WINDOW_WIDTH, c.WINDOW_HEIGHT))
+        # The new mode may use a different pixel format than the menu did
+        assets.reconvert()
 
 
-    def update_display(self):
-        pygame.display.flip()
+    def update_display(self, rects=None):
+        """ Present the frame. Screens that know what changed can pass the
+            changed rectangles to present only those, or an empty list if
+            nothing did.
+        """
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def get_events(self):
         events = pygame.event.get()
@@ -242,112 +315,163 @@ class Game:
     def spawn_scuttle(self, left=True):
         y = c.WINDOW_HEIGHT * 0.73
         if not left:
-            self.enemies.append(Scuttle(self, (c.WINDOW_WIDTH + 1000, y), (-1, 0)))
-            self.particles.append(WarningParticle((c.WINDOW_WIDTH - 50, y)))
+            self.enemies.add(Scuttle(self, (c.WINDOW_WIDTH + 1000, y), (-1, 0)))
+            self.add_particle(WarningParticle, (c.WINDOW_WIDTH - 50, y))
         else:
-            self.enemies.append(Scuttle(self, (-1000, y), (1, 0)))
-            self.particles.append(WarningParticle((50, y)))
+            self.enemies.add(Scuttle(self, (-1000, y), (1, 0)))
+            self.add_particle(WarningParticle, (50, y))
 
     def spawn_orb(self, left=True):
         if left:
-            self.enemies.append(Orb(self, (-50, -random.random() * 200 - 50), direction=(1, 0)))
+            self.enemies.add(Orb(self, (-50, -random.random() * 200 - 50), direction=(1, 0)))
         else:
-            self.enemies.append(Orb(self, (c.WINDOW_WIDTH + 50, -random.random() * 200 - 50), direction=(-1, 0)))
+            self.enemies.add(Orb(self, (c.WINDOW_WIDTH + 50, -random.random() * 200 - 50), direction=(-1, 0)))
 
     def game_start(self):
         self.game_started = True
         self.start_pos = self.xpos
         pygame.mixer.music.play()
 
+    @staticmethod
+    def asset_files():
+        """ Every image, sound effect and font file, for assets.preload """
+        folders = [("images", ".png"), ("sounds", ".wav"), ("fonts", ".ttf")]
+        return [f"{folder}/{name}" for folder, extension in folders
+                for name in sorted(os.listdir(folder)) if name.endswith(extension)]
+
+    def load_assets(self):
+        """ Load everything that survives between runs. Only called once,
+            after the files have been read by assets.preload.
+        """
+        self.alef_14 = assets.font("fonts/alef.ttf", 14)
+        self.fps_font = pygame.font.SysFont("monospace", 12, bold=False)
+        self.ccs_surf = self.alef_14.render(" miles to city center", 1, (255, 255, 255))
+
+        pygame.mixer.music.load("sounds/music.ogg")
+
+        self.player_hurt = assets.sound("sounds/hurt.wav")
+        self.mrew = assets.sound("sounds/mrew.wav", volume=0.0)
+        self.nope_sound = assets.sound("sounds/nope.wav", volume=0.2)
+        self.restart_sound = assets.sound("sounds/restart.wav", volume=0.5)
+        self.rewind_sound = assets.sound("sounds/rewind.wav")
+        self.pickup_battery = assets.sound("sounds/pickup_battery.wav", volume=0.1)
+        self.pickup_kunai = assets.sound("sounds/pickup_kunai.wav", volume=0.1)
+        self.laser_sound = assets.sound("sounds/laser.wav", volume=0.75)
+        self.explosion_sound = assets.sound("sounds/explosion.wav")
+        self.shoot_kunai_sound = assets.sound("sounds/throw_kunai.wav", volume=0.2)
+        self.laser_aim = assets.sound("sounds/laser_aim.wav", volume=0.2)
+        self.kunai_hit = assets.sound("sounds/kunai_hit.wav", volume=0.8)
+        self.jump_sound = assets.sound("sounds/jump.wav", volume=0.3)
+
+        self.horizon = c.GAME_HEIGHT * 0.6
+        self.floor = c.GAME_HEIGHT - 140
+
+        #   Copied, since the title fades in with set_alpha
+        self.title = assets.image("images/title.png", colorkey=(255, 0, 0)).copy()
+        self.press_e = assets.image("images/press_e.png")
+
+        self.shade = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
+        self.shade.fill((0, 0, 0))
+
+        self.water_texture = assets.image("images/water.png")
+
+        self.background = assets.image("images/bakground.png")
+        self.background_reflection = pygame.transform.flip(self.background, 0, 1)
+        self.background_buildings = assets.image("images/background_buildings.png", colorkey=(255, 255, 255))
+        self.bb_reflection = pygame.transform.flip(self.background_buildings, 0, 1)
+        self.bb_reflection.set_colorkey(self.background_buildings.get_colorkey())
+        self.water_shade = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT - self.horizon))
+        self.water_shade.fill((0, 0, 0))
+        self.foreground_buildings = assets.image("images/foreground_buildings.png", colorkey=(255, 255, 255))
+        self.sun = assets.image("images/sun.png")
+        self.train = assets.image("images/train.png")
+
+        self.blue_color = assets.image("images/blue.png").get_at((0, 0))
+
+        # Full-screen layers for the sun flashes and tints
+        self.overlays = OverlayManager((c.GAME_WIDTH, c.GAME_HEIGHT), colors=[(255, 255, 255), (0, 0, 0), (255, 0, 0)])
+
+        # The world is drawn straight onto the screen, or below a render scale
+        # of 1, onto a smaller surface that is scaled up to it once a frame
+        render_scale = c.RENDER_SCALE * c.WINDOW_WIDTH / c.GAME_WIDTH
+        if render_scale == 1:
+            self.world = self.screen
+        else:
+            self.world = RenderTarget((c.GAME_WIDTH, c.GAME_HEIGHT), render_scale)
+        self.background_compositor = BackgroundCompositor(self, scale=render_scale)
+
+        self.kunai_ui = assets.image("images/kunai_ui.png")
+
+        self.quad_ui = assets.image("images/charge_quadrant_one.png")
+        self.quad_color_ui = assets.image("images/charge_quad_color.png", colorkey=(0, 0, 0))
+        self.center_ui = assets.image("images/charge_center.png")
+        self.center_color_ui = assets.image("images/charge_center_color.png", colorkey=(0, 0, 0)).copy()
+
+        # The charge meter's quadrants turned to each corner, so the HUD
+        # doesn't make new surfaces every frame
+        self.quad_uis = [pygame.transform.rotate(self.quad_ui, -90 * i) for i in range(4)]
+        self.quad_color_uis = [pygame.transform.rotate(self.quad_color_ui, -90 * i) for i in range(4)]
+        self.charge_back_ui = assets.image("images/charge_background.png")
+        self.charge_glow = assets.image("images/charge_glow.png")
+
+        # Warm up what entities ask for when they spawn mid-game
+        Player.load_animations()
+        Orb.load_animations(False)
+        Orb.load_animations(True)
+        Scuttle.load_animations(False)
+        Scuttle.load_animations(True)
+        BatterySwarm.load_surfaces()
+        Kunai.load_atlas()
+        WarningParticle.load_surface()
+        RewindSwarm.load_table()
+        BigBoom.load_frames()
+        SparkEmitter.load_circles()
+
     def init(self):
+        """ Reset the state of a single run. Assets come from load_assets. """
         self.day = 1
         self.xpos = 0
         self.speed = 500
-        self.since_orb = 0
-
-        self.ccs_surf = None
 
         self.start_pos = 0
-        self.alef_14 = pygame.font.Font("fonts/alef.ttf", 14)
 
-        self.shade = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.shade.fill((0, 0, 0))
         self.shade_alpha = 255
 
         self.really_lost = False
 
         self.game_started = False
 
-        self.music = pygame.mixer.music.load("sounds/music.ogg")
-
-        self.player_hurt = pygame.mixer.Sound("sounds/hurt.wav")
-        self.mrew = pygame.mixer.Sound("sounds/mrew.wav")
-        self.mrew.set_volume(0.0)
+        # Loading the track used to stop whatever was playing from the last run
+        pygame.mixer.music.stop()
 
-        self.title = pygame.image.load("images/title.png")
-        self.title.set_colorkey((255, 0, 0))
+        self.title.set_alpha(None)
         self.title_pos = int(c.WINDOW_HEIGHT * 0.3)
 
-        self.nope_sound = pygame.mixer.Sound("sounds/nope.wav")
-        self.nope_sound.set_volume(0.2)
-        self.restart_sound = pygame.mixer.Sound("sounds/restart.wav")
-        self.restart_sound.set_volume(0.5)
-        self.rewind_sound = pygame.mixer.Sound("sounds/rewind.wav")
-        self.pickup_battery = pygame.mixer.Sound("sounds/pickup_battery.wav")
-        self.pickup_battery.set_volume(0.1)
-        self.pickup_kunai = pygame.mixer.Sound("sounds/pickup_kunai.wav")
-        self.pickup_kunai.set_volume(0.1)
-        self.laser_sound = pygame.mixer.Sound("sounds/laser.wav")
-        self.laser_sound.set_volume(0.75)
-        self.explosion_sound = pygame.mixer.Sound("sounds/explosion.wav")
-        self.shoot_kunai_sound = pygame.mixer.Sound("sounds/throw_kunai.wav")
-        self.shoot_kunai_sound.set_volume(0.2)
-        self.laser_aim = pygame.mixer.Sound("sounds/laser_aim.wav")
-        self.laser_aim.set_volume(0.2)
-        self.kunai_hit = pygame.mixer.Sound("sounds/kunai_hit.wav")
-        self.kunai_hit.set_volume(0.8)
-        self.jump_sound = pygame.mixer.Sound("sounds/jump.wav")
-        self.jump_sound.set_volume(0.3)
-
-
-        self.press_e= pygame.image.load("images/press_e.png")
-
-        self.horizon = c.GAME_HEIGHT * 0.6
-        self.floor = c.GAME_HEIGHT - 140
         self.game_time = 0
 
         self.player = Player(self)
         self.player.position = Pose((c.GAME_WIDTH//2, -100))
 
-        self.particles = []
-        self.enemies = []
-
-        self.water_texture = pygame.image.load("images/water.png")
-
-        self.background = pygame.image.load("images/bakground.png")
-        self.background_reflection = pygame.transform.flip(self.background, 0, 1)
-        self.background_buildings = pygame.image.load("images/background_buildings.png")
-        self.background_buildings.set_colorkey((255, 255, 255))
-        self.bb_reflection = pygame.transform.flip(self.background_buildings, 0, 1)
-        self.bb_reflection.set_colorkey((255, 255, 255))
-        self.water_shade = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT - self.horizon))
-        self.water_shade.fill((0, 0, 0))
-        self.foreground_buildings = pygame.image.load("images/foreground_buildings.png")
-        self.foreground_buildings.set_colorkey((255, 255, 255))
-        self.sun = pygame.image.load("images/sun.png")
-        self.train = pygame.image.load("images/train.png")
-
-        self.blue = pygame.image.load("images/blue.png")
-        self.blue = pygame.transform.scale(self.blue, (c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.blue_color = self.blue.get_at((0, 0))
+        self.particles = EntityList(ordered=True)
+        self.particle_pool = ParticlePool(
+            sizes={
+                BigBoom: 16,
+                WarningParticle: 4,
+                Laser: 4,
+                LaserGuide: 4,
+                SunTint: 1,
+                SunExplosion: 1,
+                RewindSwarm: 1,
+                SunExplosionLong: 0,
+            },
+        )
+        self.sparks = SparkEmitter()
+        self.enemies = EnemyRegistry()
+        self.projectile_grid = SpatialHash(cell_size=128)
 
         self.clock = pygame.time.Clock()
-        self.fps_font = pygame.font.SysFont("monospace", 12, bold=False)
         self.fpss = [0]
 
-        self.lightener = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.lightener.fill((255, 255, 255))
-        self.lightener.set_alpha(30)
         self.day_when_rewind = 1
 
         self.rewinding = False
@@ -356,17 +480,18 @@ class Game:
         self.shake_direction = Pose((1, 0))
         self.since_shake = 0
 
-        self.kunai_ui = pygame.image.load("images/kunai_ui.png")
-        self.pickups = []
+        self.batteries = BatterySwarm(self)
 
-        self.quad_ui = pygame.image.load("images/charge_quadrant_one.png")
-        self.quad_color_ui = pygame.image.load("images/charge_quad_color.png")
-        self.center_ui = pygame.image.load("images/charge_center.png")
-        self.center_color_ui = pygame.image.load("images/charge_center_color.png")
-        self.charge_back_ui = pygame.image.load("images/charge_background.png")
-        self.charge_glow = pygame.image.load("images/charge_glow.png")
+        self.collisions = CollisionWorld()
+        self.collisions.add_layer("player", lambda: ([self.player], [self.player.position.get_position()]))
+        self.collisions.add_layer("enemies", self.get_live_enemies)
+        self.collisions.add_layer("projectiles", self.player.get_loose_projectiles)
+        self.collisions.add_layer("pickups", lambda: (None, self.batteries.live_positions()))
+        self.collisions.on_overlap("player", "enemies", 50, Player.touch_enemy)
+        self.collisions.on_overlap("player", "projectiles", 30, Player.pick_up_projectile)
+        self.collisions.on_overlap("player", "pickups", 50, self.batteries.collect, batched=True)
 
-        self.since_scuttle = 0
+        self.spawner = SpawnTimeline(WAVES, seed=random.randrange(2**32))
 
 
     def get_offset(self):
@@ -393,10 +518,6 @@ class Game:
             if self.day < 0:
                 self.day = 0
 
-        lightness = self.day
-        bc = tuple([max(0, int(item * lightness)) for item in self.blue_color])
-        self.blue.fill(bc)
-
         if self.rewinding and self.speed > 100:
             self.speed = max(self.speed - 2000 * dt, 50)
         if not self.rewinding:
@@ -424,58 +545,7 @@ class Game:
         surface.blit(surf, (c.GAME_WIDTH - surf.get_width() - 10, 10 + label.get_height()))
 
     def draw_background(self, surf, offset=(0, 0)):
-        bgh = self.background.get_height()
-        margin = max(0, bgh - c.GAME_HEIGHT)
-        bgy = -margin * self.day
-        ba = pygame.Rect((0, -bgy, c.GAME_WIDTH, self.horizon))
-        surf.blit(self.background, (0, 0), area=ba)
-        bra = pygame.Rect((0, margin * (1 - self.day) + (c.GAME_HEIGHT - self.horizon)/2, c.GAME_WIDTH, c.GAME_HEIGHT - self.horizon))
-        surf.blit(self.background_reflection, (0, self.horizon), area=bra)
-
-
-
-        sun_peak_height = self.sun.get_height() * 1.5
-        sx = c.GAME_WIDTH//2 - self.sun.get_width()//2 + offset[0]
-        sy = int(self.horizon - sun_peak_height * self.day + offset[1])
-        sa = (0, 0, self.sun.get_width(), int(sun_peak_height * self.day))
-        surf.blit(self.sun, (sx, sy), area=sa)
-
-        bbw = self.background_buildings.get_width()
-        bbh = self.background_buildings.get_height()
-        bbx = int((-self.xpos * 0.1) % bbw - bbw + offset[0])
-        bby = int(self.horizon + offset[1])
-        while bbx < c.GAME_WIDTH:
-            surf.blit(self.background_buildings, (bbx, bby - bbh))
-            surf.blit(self.bb_reflection, (bbx, bby))
-            bbx += bbw
-
-        self.water_shade.set_alpha(60 + 20 * self.day)
-        surf.blit(self.water_shade, (0, self.horizon + offset[1]))
-        surf.blit(self.water_texture, (0, self.horizon + offset[1]), special_flags= pygame.BLEND_ADD)
-
-        fbw = self.foreground_buildings.get_width()
-        fbh = self.foreground_buildings.get_height()
-        fbx = int((-self.xpos * 0.7) % fbw - fbw + offset[0])
-        fby = int(c.GAME_HEIGHT + offset[1] - fbh + 30)
-        while fbx < c.GAME_WIDTH:
-            surf.blit(self.foreground_buildings, (fbx, fby))
-            fbx += fbw
-
-        surf.blit(self.blue, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
-
-        train_center_x = c.GAME_WIDTH//2
-        train_spacing = 5
-        train_width = self.train.get_width()
-        train_start_x = train_center_x - self.train.get_width()//2 + offset[0] - train_spacing - train_width
-
-        if self.colorblind_mode:
-            surf.blit((self.lightener), (0, 0))
-
-        for number in range(3):
-            xo, yo = self.get_train_offset(number)
-            train_x = int(train_start_x + number * train_spacing + number * train_width + xo)
-            train_y = int(self.floor - 5 + yo + offset[1])
-            surf.blit(self.train, (train_x, train_y), special_flags=pygame.BLEND_MULT)
+        self.background_compositor.draw(surf, offset)
 
     def get_train_number(self, x):
         train_center_x = c.GAME_WIDTH // 2
@@ -500,11 +570,22 @@ class Game:
         self.day_when_rewind = self.day
         if self.day_when_rewind == 1:
             self.day_when_rewind = 0.999
-        for i in range(1000):
-            self.particles.append(RewindParticle(self))
-        self.particles.append(SunTint(duration=3, alpha=100))
+        self.add_particle(RewindSwarm, self)
+        self.add_particle(SunTint, self, duration=3, alpha=100)
         self.destroy_all_enemies(silent=True)
 
+    def add_particle(self, cls, *args, **kwargs):
+        """ Start a particle of class cls, reusing a finished one if the pool
+            has one.
+        """
+        particle = self.particle_pool.acquire(cls, *args, **kwargs)
+        self.particles.add(particle)
+        return particle
+
+    def get_live_enemies(self):
+        enemies = [enemy for enemy in self.enemies if not enemy.destroyed]
+        return enemies, [enemy.position.get_position() for enemy in enemies]
+
     def destroy_all_enemies(self, silent=False):
         for enemy in self.enemies:
             if not enemy.destroyed:
@@ -520,13 +601,13 @@ class Game:
         self.rewinding = False
         self.day = 1
         self.player.end_tractor_beam()
-        self.particles.append(SunExplosion(self))
+        self.add_particle(SunExplosion, self)
         self.player.charge = 0
 
     def lose(self):
         if self.lost:
             return
-        self.particles.append(SunExplosionLong(self, duration=6, color=(255, 0, 0), callback=self.really_lose))
+        self.add_particle(SunExplosionLong, self, duration=6, color=(255, 0, 0), callback=self.really_lose)
         self.lost = True
         self.last_distance = self.xpos
 
@@ -548,29 +629,22 @@ class Game:
         x = c.WINDOW_WIDTH//2 - self.charge_back_ui.get_width()//2
         y = c.WINDOW_HEIGHT - 105 - self.charge_back_ui.get_height()//22
 
-        quad = self.quad_ui.copy()
-        quad_color = self.quad_color_ui.copy()
-        quad_color.set_colorkey((0, 0, 0))
-        center_color = self.center_color_ui.copy()
-        center_color.set_colorkey((0, 0, 0))
+        center_color = self.center_color_ui
         if quads >= 5:
             glow = self.charge_glow.copy()
             dark = pygame.Surface(glow.get_size())
             dark.fill((0, 0, 0))
             dark.set_alpha(50 + 128 * math.sin(self.game_time*6))
             glow.blit(dark, (0, 0))
-            surf.blit(glow, (x - glow.get_width()//2 + quad.get_width()//2, y), special_flags=pygame.BLEND_ADD)
+            surf.blit(glow, (x - glow.get_width()//2 + self.quad_ui.get_width()//2, y), special_flags=pygame.BLEND_ADD)
             if not self.rewinding and self.game_time%1 < 0.7:
                 pos = c.WINDOW_WIDTH//2 - self.press_e.get_width()//2, y - 28
                 surf.blit(self.press_e, pos)
         surf.blit(self.charge_back_ui, (x, y))
-        for i in range(4):
-            if i >= quads:
-                break
+        for quad in self.quad_uis[:quads]:
             surf.blit(quad, (x, y))
-            quad = pygame.transform.rotate(quad, -90)
-            quad_color = pygame.transform.rotate(quad_color, -90)
         if quads < 4:
+            quad_color = self.quad_color_uis[quads]
             quad_color.set_alpha(remainder/charge_per_section * 255)
             surf.blit(quad_color, (x, y))
         elif quads < 5:
@@ -588,8 +662,6 @@ class Game:
         city_center_string = f"{miles} miles to city center"
         context_string = f"Last run:"
         ccs_string = self.alef_14.render(f"{miles}", 1, (255, 255, 255))
-        if not self.ccs_surf:
-            self.ccs_surf = self.alef_14.render(" miles to city center", 1, (255, 255, 255))
         surf.blit(ccs_string, (c.WINDOW_WIDTH - ccs_string.get_width() - self.ccs_surf.get_width() - 5, c.WINDOW_HEIGHT - ccs_string.get_height() - 3))
         surf.blit(self.ccs_surf, (c.WINDOW_WIDTH - self.ccs_surf.get_width() - 5, c.WINDOW_HEIGHT - self.ccs_surf.get_height() - 3))
 
@@ -603,6 +675,33 @@ class Game:
     def get_multiplier(self):
         return ((self.xpos - self.start_pos)/14000 + 3)/3
 
+    def draw_world(self, surf, offset=(0, 0)):
+        """ Draw everything in a frame of a run onto surf, in game coordinates """
+        self.draw_background(surf, offset)
+        self.draw_hud(surf)
+        self.batteries.draw(surf, offset)
+        for enemy in self.enemies:
+            enemy.draw(surf, offset)
+        self.sparks.draw(surf, offset)
+        for particle in self.particles:
+            particle.draw(surf, offset)
+        self.overlays.draw(surf)
+        self.player.draw(surf, offset)
+        self.draw_fps(surf)
+
+        x = c.GAME_WIDTH//2 - self.title.get_width()//2
+        y = int(c.GAME_HEIGHT * 0.3) - self.title.get_height()//2
+        surf.blit(self.title, (x, y))
+
+        if self.shade_alpha > 0:
+            self.shade.set_alpha(self.shade_alpha)
+            surf.blit(self.shade, (0, 0))
+
+    def mouse_position(self):
+        """ Where the mouse is, in game coordinates """
+        x, y = pygame.mouse.get_pos()
+        return Pose((x * c.GAME_WIDTH / self.screen.get_width(), y * c.GAME_HEIGHT / self.screen.get_height()))
+
     def main(self):
         self.lost = False
         self.clock.tick(60)
@@ -620,73 +719,45 @@ class Game:
             self.shade_alpha -= 1500 * dt
 
             if self.game_started:
-                keep_particles = []
                 for particle in self.particles:
                     particle.update(dt, events)
-                    if not particle.destroyed:
-                        keep_particles.append(particle)
-                self.particles = keep_particles
+                    if particle.destroyed:
+                        self.particles.remove(particle)
+                self.sparks.update(dt, events)
                 if self.lost:
                     dt *= 0.01
                     events = [event for event in events if event.type != pygame.KEYDOWN and event.type != pygame.MOUSEBUTTONDOWN]
                 self.player.update(dt, events)
-                for pickup in self.pickups[:]:
-                    pickup.update(dt, events)
-                for enemy in self.enemies[:]:
+                self.projectile_grid.rebuild(projectile for projectile in self.player.projectiles
+                                             if not projectile.stuck and not projectile.pickup)
+                self.batteries.update(dt, events)
+                self.collisions.resolve()
+                #   Culling checks every enemy, since they all move every frame.
+                #   It rides along with updating them, which costs far more.
+                cull_distance_squared = (c.WINDOW_WIDTH * 3)**2
+                for enemy in self.enemies:
                     enemy.update(dt, events)
-                    if (enemy.position - self.player.position).magnitude() > c.WINDOW_WIDTH * 3:
+                    if enemy.position.distance_squared_to(self.player.position) > cull_distance_squared:
                         self.enemies.remove(enemy)
 
-                self.since_scuttle += dt
-                self.since_orb += dt
-                if self.since_scuttle > 3.5 / self.get_multiplier():
-                    self.since_scuttle = 0
-                    self.spawn_scuttle(random.choice([0, 1]))
-
-                if self.get_multiplier() > 1.4:
-                    if self.since_orb > 8 / self.get_multiplier():
-                        has_left = False
-                        has_right = False
-                        for enemy in self.enemies:
-                            if type(enemy) == Orb:
-                                if enemy.direction.x < 0:
-                                    has_right = True
-                                else:
-                                    has_left = True
-                        if not has_left and not has_right:
-                            self.spawn_orb(random.choice((1, 0)))
-                            self.since_orb = 0
-                        elif not (has_left and has_right):
-                            self.spawn_orb(has_right)
-                            self.since_orb = 0
-
-            offset = self.get_offset()
-
+                self.spawner.update(self, dt)
 
+                #   Removals made during the tick take effect here, all at once
+                self.enemies.flush()
+                self.player.projectiles.flush()
+                for particle in self.particles.flush():
+                    self.particle_pool.release(particle)
 
-            self.draw_background(self.screen, offset)
-            self.draw_hud(self.screen)
-            for pickup in self.pickups:
-                pickup.draw(self.screen, offset)
-            for enemy in self.enemies:
-                enemy.draw(self.screen, offset)
-            for particle in self.particles[:]:
-                particle.draw(self.screen, offset)
-            self.player.draw(self.screen, offset)
-            self.draw_fps(self.screen)
+            offset = self.get_offset()
 
-            x = c.GAME_WIDTH//2 - self.title.get_width()//2
-            y = int(c.GAME_HEIGHT * 0.3) - self.title.get_height()//2
-            self.screen.blit(self.title, (x, y))
+            self.draw_world(self.world, offset)
+            if self.world is not self.screen:
+                self.world.present(self.screen)
 
             if self.game_started:
                 self.title_pos -= 1000 * dt
                 self.title.set_alpha(self.title_pos * 255 / c.GAME_HEIGHT / 0.3)
 
-            if self.shade_alpha > 0:
-                self.shade.set_alpha(self.shade_alpha)
-                self.screen.blit(self.shade, (0, 0))
-
             for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
@@ -0,0 +1,46 @@
+import numpy as np
+
+import constants as c
+
+
+class LightingTable:
+    """ Everything about the scene's lighting that depends only on the time
+        of day, worked out once for each of steps evenly spaced days, so the
+        renderer looks it up instead of recomputing it every frame.
+    """
+
+    #   Opacity of the white wash laid over everything in colorblind mode
+    lightener_alpha = 30
+
+    def __init__(self, game, steps=512):
+        self.steps = steps
+        day = np.linspace(0, 1, steps)
+
+        #   Night tint added over the whole scene
+        blue = np.array(game.blue_color[:3], dtype=float)
+        self.tint = np.maximum(0, (blue * day[:, None]).astype(int))
+
+        #   The tint followed by the lightener, as one multiply and one add:
+        #   (x + tint) * (1 - a) + 255 * a  ==  x * (1 - a) + (tint * (1 - a) + 255 * a)
+        keep = 255 - self.lightener_alpha
+        self.lit_multiply = (keep, keep, keep)
+        self.lit_tint = np.minimum(255, np.round(self.tint * keep / 255 + self.lightener_alpha)).astype(int)
+
+        #   Which part of the sky and its reflection is showing
+        margin = max(0, game.background.get_height() - c.GAME_HEIGHT)
+        self.sky_top = margin * day
+        self.reflection_top = margin * (1 - day) + (c.GAME_HEIGHT - game.horizon)/2
+
+        #   How far the sun has risen over the horizon
+        sun_peak_height = game.sun.get_height() * 1.5
+        self.sun_y = (game.horizon - sun_peak_height * day).astype(int)
+        self.sun_height = (sun_peak_height * day).astype(int)
+
+        self.shade_alpha = (60 + 20 * day).astype(int)
+
+    def step(self, day):
+        """ Index of the entry nearest day """
+        return int(round(min(max(day, 0), 1) * (self.steps - 1)))
+
+    def day(self, step):
+        return step / (self.steps - 1)
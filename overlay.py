@@ -0,0 +1,76 @@
+import pygame
+
+from render import forget
+
+
+class OverlayManager:
+    """ Owns the full-screen color layers that flashes and tints fade in and
+        out with. Effects queue a color and alpha with add() while they draw,
+        and draw() blends everything queued that frame onto the screen with a
+        single blit, reusing the same preallocated surfaces every time.
+    """
+
+    def __init__(self, size, colors=()):
+        """ size: size of the layers, in pixels
+            colors: colors to allocate layers for up front
+        """
+        self.size = size
+        self.layers = {}
+        for color in colors:
+            self.layer(color)
+        self.mixed = pygame.Surface(size)
+        self.pending = []
+
+    def layer(self, color):
+        """ Return the full-screen surface filled with color, making it the
+            first time the color is asked for.
+        """
+        color = tuple(color)
+        if color not in self.layers:
+            surf = pygame.Surface(self.size)
+            surf.fill(color)
+            self.layers[color] = surf
+        return self.layers[color]
+
+    def add(self, color, alpha=255):
+        """ Queue color to be laid over the screen this frame, at alpha
+            opacity. Overlays added later go on top.
+        """
+        alpha = min(max(alpha, 0), 255)
+        if alpha > 0:
+            self.pending.append((tuple(color), alpha))
+
+    def clear(self):
+        self.pending = []
+
+    def draw(self, surface):
+        """ Blend every overlay queued this frame onto surface. """
+        if not self.pending:
+            return
+        if len(self.pending) == 1:
+            color, alpha = self.pending[0]
+            surf = self.layer(color)
+        else:
+            color, alpha = self.composite(self.pending)
+            surf = self.mixed
+            surf.fill(color)
+            forget(surface, surf)
+        surf.set_alpha(alpha)
+        surface.blit(surf, (0, 0))
+        self.pending = []
+
+    @staticmethod
+    def composite(overlays):
+        """ Return the single (color, alpha) that looks the same as laying
+            each (color, alpha) in overlays over the screen in turn.
+        """
+        remaining = 1  # how much of the screen underneath still shows through
+        mixed = [0, 0, 0]
+        for color, alpha in overlays:
+            opacity = alpha / 255
+            for i in range(3):
+                mixed[i] = mixed[i] * (1 - opacity) + color[i] * opacity
+            remaining *= 1 - opacity
+        coverage = 1 - remaining
+        color = tuple(min(255, int(round(channel / coverage))) for channel in mixed)
+        return color, coverage * 255
@@ -1,15 +1,28 @@
 from primitives import Pose
-import random
 import math
 import pygame
+import numpy as np
 import constants as c
+from assets import assets
+from render import draw_circle, draw_rect
 
 
 class Particle:
 
+    #   Made on the first initialization, then reused when the particle is
+    #   recycled through a ParticlePool
+    position = None
+    velocity = None
+
     def __init__(self, position=(0, 0), velocity=(0, 0), duration=1):
-        self.position = Pose(position)
-        self.velocity = Pose(velocity)
+        if self.position is None:
+            self.position = Pose(position)
+            self.velocity = Pose(velocity)
+        else:
+            self.position.set_position(position)
+            self.position.set_angle(0)
+            self.velocity.set_position(velocity)
+            self.velocity.set_angle(0)
         self.destroyed = False
         self.duration = duration
         self.age = 0
@@ -17,7 +30,7 @@ class Particle:
     def update(self, dt, events):
         if self.destroyed:
             return
-        self.position += self.velocity * dt
+        self.position.add_pose(self.velocity, weight=dt)
         self.age += dt
         if self.age > self.duration:
             self.destroy()
@@ -32,95 +45,78 @@ class Particle:
     def destroy(self):
         self.destroyed = True
 
+    def reset(self, *args, **kwargs):
+        """ Start a finished particle over, taking the same arguments as its
+            constructor.
+        """
+        self.__init__(*args, **kwargs)
 
-class KunaiHitParticle(Particle):
-
-    def __init__(self, position, velocity=None, duration=0.3, color=(255, 255, 255)):
-        self.color = color
-        velocity_mag = random.random()**2 * 700 + 300
-        if not velocity:
-            velocity_angle = random.random() * 2 * math.pi
-        else:
-            velocity_angle = math.atan2(velocity[0], velocity[1]) + random.choice((-1, 1))*random.random()**4*math.pi/2
-        velocity_x = math.sin(velocity_angle) * velocity_mag
-        velocity_y = math.cos(velocity_angle) * velocity_mag
-        velocity = velocity_x, velocity_y
-        super().__init__(position=position, velocity=velocity, duration=duration)
-        self.age += random.random() * 0.3
-
-    def update(self, dt, events):
-        super().update(dt, events)
-        self.velocity *= 0.005**dt
-
-    def draw(self, surf, offset=(0, 0)):
-        if self.destroyed:
-            return
-        corners = [[3, 0], [0, -0.5], [-1, 0], [0, 0.5]]
-
-        angle = math.atan2(self.velocity.y, self.velocity.x)
-
-        scale = 15 * (1 - self.through())
-        for corner in corners:
-            original_angle = math.atan2(corner[1], corner[0])
-            new_angle = angle - original_angle
-            mag = math.sqrt(corner[0]**2 + corner[1]**2)
-            mag *= scale
-            corner[0] = math.cos(new_angle) * mag
-            corner[1] = math.sin(new_angle) * mag
-            corner[0] += self.position.x
-            corner[1] += self.position.y
-
-        pygame.draw.polygon(surf, self.color, corners)
 
+class RewindSwarm(Particle):
+    """ The swirl of streaks that circles the sun while time is rewinding.
+        Every streak's angle and distance live in arrays, and each one is
+        drawn from a table of streaks pre-rendered at every rotation and
+        brightness, so a frame is a single batch of blits.
+    """
 
-        pass
+    table = None
+    half_sizes = None
+    rotation_steps = 90  # over 180 degrees, since a streak looks the same flipped
+    darkness_steps = 12
 
-
-class RewindParticle(Particle):
-
-    surf = None
-
-    def __init__(self, game, duration = 3):
-        self.game = game
-        if not self.surf:
-            self.surf = pygame.Surface((40, 6))
-            self.surf.fill((0, 0, 0))
-            pygame.draw.ellipse(self.surf, (100, 255, 255), self.surf.get_rect())
-            self.surf.set_colorkey((0, 0, 0))
-
-        self.angle = random.random() * math.pi * 2
-        self.distance = random.random() * c.GAME_WIDTH//2 + 100
-        self.start_distance = self.distance
+    def __init__(self, game, count=1000, duration=3):
         super().__init__(duration=duration)
+        self.game = game
+        if not self.table:
+            RewindSwarm.load_table()
+
+        self.angles = np.random.random(count) * math.pi * 2
+        self.distances = (np.random.random(count) * c.GAME_WIDTH)//2 + 100
+
+    @staticmethod
+    def load_table():
+        """ table[darkness][rotation] is a streak darkened by darkness steps
+            from 200 to 255 alpha of black, rotated by rotation steps.
+        """
+        streak = pygame.Surface((40, 6))
+        streak.fill((0, 0, 0))
+        pygame.draw.ellipse(streak, (100, 255, 255), streak.get_rect())
+        streak.set_colorkey((0, 0, 0))
+
+        table = []
+        for level in range(RewindSwarm.darkness_steps):
+            darkened = streak.copy()
+            dark = pygame.Surface(darkened.get_size())
+            dark.fill((0, 0, 0))
+            dark.set_alpha(200 + 55 * level / (RewindSwarm.darkness_steps - 1))
+            darkened.blit(dark, (0, 0))
+            table.append([pygame.transform.rotate(darkened, step * 180 / RewindSwarm.rotation_steps)
+                          for step in range(RewindSwarm.rotation_steps)])
+        RewindSwarm.table = table
+        RewindSwarm.half_sizes = np.array([(rotated.get_width()//2, rotated.get_height()//2)
+                                           for rotated in table[0]])
 
     def update(self, dt, events):
         if self.destroyed:
             return
-        self.angle -= 300 * dt / self.distance * (self.through()) * 5
-        self.distance -= 0 * dt * self.through()
+        self.angles -= 300 * dt / self.distances * self.through() * 5
         super().update(dt, events)
 
-
     def draw(self, surf, offset=(0, 0)):
         if self.destroyed:
             return
-        margin = 10
-        if self.position.x < -margin or self.position.x > c.GAME_WIDTH + margin:
-            if self.position.y < - margin or self.position.y > c.GAME_HEIGHT + margin:
-                return
-        surf_to_draw = self.surf.copy()
-        darken_alpha = 200 + 55 * (1 - self.through()) #((1 - self.through()**2)) * 100 + 155
-        dark = pygame.Surface(surf_to_draw.get_size())
-        dark.fill((0, 0, 0))
-        dark.set_alpha(darken_alpha)
-        surf_to_draw.blit(dark, (0, 0))
-        surf_to_draw = pygame.transform.rotate(surf_to_draw, math.degrees(-self.angle + math.pi/2))
-        x = offset[0] + c.WINDOW_WIDTH//2 + math.cos(self.angle) * self.distance - surf_to_draw.get_width()//2
-        y = offset[1] + c.WINDOW_HEIGHT//2 - 150 + math.sin(self.angle) * self.distance - surf_to_draw.get_height()//2
-        y += (1 - self.game.day) * 300
-        surf.blit(surf_to_draw, (x, y), special_flags=pygame.BLEND_ADD)
-
-        pass
+        darken_alpha = 200 + 55 * (1 - self.through())
+        level = round((darken_alpha - 200) / 55 * (self.darkness_steps - 1))
+        frames = self.table[min(max(level, 0), self.darkness_steps - 1)]
+
+        rotations = np.degrees(-self.angles + math.pi/2) % 180
+        steps = np.rint(rotations * self.rotation_steps / 180).astype(int) % self.rotation_steps
+        xs = offset[0] + c.WINDOW_WIDTH//2 + np.cos(self.angles) * self.distances - self.half_sizes[steps, 0]
+        ys = offset[1] + c.WINDOW_HEIGHT//2 - 150 + np.sin(self.angles) * self.distances - self.half_sizes[steps, 1]
+        ys += (1 - self.game.day) * 300
+
+        surf.blits([(frames[step], (x, y), None, pygame.BLEND_ADD)
+                    for step, x, y in zip(steps.tolist(), xs.tolist(), ys.tolist())], doreturn=False)
 
 
 class SunExplosion(Particle):
@@ -128,8 +124,6 @@ class SunExplosion(Particle):
     def __init__(self, game, duration = 0.7, color = (255, 255, 255)):
         super().__init__(duration=duration)
         self.color = color
-        self.light = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.light.fill(color)
         self.game = game
         self.game.shake(amt=30)
 
@@ -144,20 +138,15 @@ class SunExplosion(Particle):
             max_rad = math.sqrt(c.WINDOW_WIDTH**2 + c.WINDOW_HEIGHT**2) * 0.75
             min_rad = 110
             rad = min_rad + (max_rad - min_rad) * math.sqrt(self.through())*2
-            pygame.draw.circle(surface, self.color, (c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT//2 - 150), rad)
+            draw_circle(surface, self.color, (c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT//2 - 150), rad)
         else:
-            self.light.set_alpha(255 - (255 * 2 * (self.through() - 0.5)))
-            surface.blit(self.light, (0, 0))
+            self.game.overlays.add(self.color, 255 - (255 * 2 * (self.through() - 0.5)))
 
 class SunExplosionLong(Particle):
 
     def __init__(self, game, duration = 10, color = (255, 255, 255), callback=None):
         super().__init__(duration=duration)
         self.color = color
-        self.light = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.light.fill(color)
-        self.dark = pygame.Surface(self.light.get_size())
-        self.dark.fill((0, 0, 0))
         self.game = game
         self.game.shake(amt=30)
         self.callback = callback
@@ -173,88 +162,66 @@ class SunExplosionLong(Particle):
             max_rad = math.sqrt(c.WINDOW_WIDTH**2 + c.WINDOW_HEIGHT**2) * 0.75
             min_rad = 110
             rad = min_rad + (max_rad - min_rad) * math.sqrt(self.through())*10
-            pygame.draw.circle(surface, self.color, (c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT//2 - 150), rad)
+            draw_circle(surface, self.color, (c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT//2 - 150), rad)
         else:
-            self.light.set_alpha(255 - (255 * 1.1111 * (self.through() - 0.1)))
-            surface.blit(self.dark, (0, 0))
-            surface.blit(self.light, (0, 0))
+            self.game.overlays.add((0, 0, 0))
+            self.game.overlays.add(self.color, 255 - (255 * 1.1111 * (self.through() - 0.1)))
 
 class SunTint(Particle):
 
-    def __init__(self, duration = 0.7, alpha = 255):
+    def __init__(self, game, duration = 0.7, alpha = 255):
         super().__init__(duration=duration)
-        self.light = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT))
-        self.light.fill((255, 255, 255))
+        self.game = game
         self.start_alpha = alpha
 
     def update(self, dt, events):
         super().update(dt, events)
 
     def draw(self, surface, offset=(0, 0)):
-        self.light.set_alpha(self.through() * self.start_alpha)
-        surface.blit(self.light, (0, 0))
+        self.game.overlays.add((255, 255, 255), self.through() * self.start_alpha)
 
 
 class BigBoom(Particle):
 
-    surf = None
+    #   The flash pre-scaled to evenly spaced sizes between starting_scale
+    #   and full size, so drawing it never has to scale a surface
+    frames = None
+    scale_steps = 48
+    starting_scale = 0.1
+
     def __init__(self, position, velocity=None, duration=0.3):
         super().__init__(position=position, duration=duration)
-        if not self.surf:
-            self.surf = pygame.Surface((400, 400))
-            self.surf.fill((0, 0, 0))
-            pygame.draw.ellipse(self.surf, (255, 255, 255), self.surf.get_rect())
-            self.surf.set_colorkey((0, 0, 0))
-        self.starting_scale = 0.1
+        if not self.frames:
+            BigBoom.load_frames()
         self.scale = self.starting_scale
         self.alpha = 255
 
+    @staticmethod
+    def load_frames():
+        surf = pygame.Surface((400, 400))
+        surf.fill((0, 0, 0))
+        pygame.draw.ellipse(surf, (255, 255, 255), surf.get_rect())
+        surf.set_colorkey((0, 0, 0))
+        frames = []
+        for step in range(BigBoom.scale_steps):
+            scale = BigBoom.starting_scale + (1 - BigBoom.starting_scale) * step / (BigBoom.scale_steps - 1)
+            frames.append(pygame.transform.scale(surf, (int(surf.get_width()*scale), int(surf.get_height()*scale))))
+        BigBoom.frames = frames
+
     def update(self, dt, events):
         self.scale = self.starting_scale + (1 - self.starting_scale) * self.through()**0.5
         self.alpha = 255 - 255*self.through()
         super().update(dt, events)
 
     def draw(self, surf, offset=(0, 0)):
-        my_surf = pygame.transform.scale(self.surf, (int(self.surf.get_width()*self.scale), int(self.surf.get_height()*self.scale) ))
+        step = round((self.scale - self.starting_scale) / (1 - self.starting_scale) * (self.scale_steps - 1))
+        my_surf = self.frames[min(max(step, 0), self.scale_steps - 1)]
         my_surf.set_alpha(self.alpha)
         x = self.position.x + offset[0] - my_surf.get_width()//2
         y = self.position.y + offset[1] - my_surf.get_height()//2
         surf.blit(my_surf, (x, y))
 
 
-class BoomParticle(Particle):
-    def __init__(self, position, velocity=None, duration=1.5):
-        velocity_mag = random.random()**4 * 700
-        if not velocity:
-            velocity_angle = random.random() * 2 * math.pi
-        else:
-            velocity_angle = math.atan2(velocity[0], velocity[1]) + random.choice((-1, 1))*(random.random()**4)*math.pi/2
-        velocity_x = math.sin(velocity_angle) * velocity_mag
-        velocity_y = math.cos(velocity_angle) * velocity_mag
-        velocity = velocity_x, velocity_y
-        super().__init__(position=position, velocity=velocity, duration=duration)
-        self.age += random.random() * 1
-
-    def update(self, dt, events):
-        super().update(dt, events)
-        if self.velocity.x > -500:
-            self.velocity.x -= 1200*dt
-        self.velocity.y *= 0.1**dt
-
-    def draw(self, surf, offset=(0, 0)):
-        if self.destroyed:
-            return
-
-        scale = (1 - self.through())
-        radius = 20
-
-        x, y = (self.position + Pose(offset)).get_position()
-        pygame.draw.circle(surf, (255, 255, 255), (x, y), radius*scale)
-
-
-        pass
-
-
 class Laser(Particle):
 
     def __init__(self, position, direction):
@@ -273,7 +240,7 @@ class Laser(Particle):
         y0 = self.position.y + offset[1] - vh//2
 
         rect = x0, y0, width, vh
-        pygame.draw.rect(surface, (255, 255, 255), rect)
+        draw_rect(surface, (255, 255, 255), rect)
 
 
 class LaserGuide(Particle):
@@ -295,43 +262,9 @@ class LaserGuide(Particle):
 
         rect = x0, y0, width, vh
         if self.age % 0.1 < 0.05:
-            pygame.draw.rect(surface, (255, 0, 0), rect)
+            draw_rect(surface, (255, 0, 0), rect)
         else:
-            pygame.draw.rect(surface, (255, 150, 150), rect)
-
-
-class LaserBoomParticle(Particle):
-    def __init__(self, position, direction=(1, 0), velocity=None, duration=1.5):
-        velocity_mag = random.random()**2 * 800
-        if not velocity:
-            velocity_angle = random.random() * 2 * math.pi
-        else:
-            velocity_angle = math.atan2(velocity[0], velocity[1]) + random.choice((-1, 1))*(random.random()**4)*math.pi/2
-        velocity_x = math.sin(velocity_angle) * velocity_mag
-        velocity_y = math.cos(velocity_angle) * velocity_mag
-        velocity = velocity_x, velocity_y
-        super().__init__(position=position, velocity=velocity, duration=duration)
-        self.age += random.random() * 0.25
-        self.velocity.x = abs(self.velocity.x) * (1 + random.random()*500/(abs(self.velocity.y) + 1))
-        if direction[0] < 1:
-            self.velocity.x *= -1
-
-    def update(self, dt, events):
-        super().update(dt, events)
-        self.velocity *= 0.01**dt
-
-    def draw(self, surf, offset=(0, 0)):
-        if self.destroyed:
-            return
-
-        scale = (1 - self.through())**2
-        radius = 25
-
-        x, y = (self.position + Pose(offset)).get_position()
-        pygame.draw.circle(surf, (255, 255, 255), (x, y), radius*scale)
-
-
-        pass
+            draw_rect(surface, (255, 150, 150), rect)
 
 
 class WarningParticle(Particle):
@@ -340,8 +273,11 @@ class WarningParticle(Particle):
     def __init__(self, position=(0, 0)):
         super().__init__(position, duration = 1.5)
         if not self.surf:
-            WarningParticle.surf = pygame.image.load("images/warning.png")
-            WarningParticle.surf.set_colorkey((0, 0, 0))
+            WarningParticle.surf = WarningParticle.load_surface()
+
+    @staticmethod
+    def load_surface():
+        return assets.image("images/warning.png", colorkey=(0, 0, 0))
 
     def update(self, dt, events):
         super().update(dt, events)
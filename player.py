@@ -1,9 +1,10 @@
-from particle import KunaiHitParticle
 from primitives import GameObject, Pose
 import pygame
 from projectile import Kunai
 import constants as c
-from sprite import Sprite, SpriteSheet
+from sprite import Sprite
+from assets import assets
+from entities import EntityList
 
 class Player(GameObject):
 
@@ -14,45 +15,40 @@ class Player(GameObject):
         self.game = game
         self.jumps = 2
         self.grounded = False
-        self.projectiles = []
+        self.projectiles = EntityList()
         self.ammo = 3
         self.beaming = False
         self.beam_target = Pose((c.GAME_WIDTH//2, c.GAME_HEIGHT//2 - 150))
         self.charge = 0
 
         self.sprite = Sprite(16)
-        idle_right = SpriteSheet("images/player_idle.png", (8, 1), 8, repeat=True)
-        run_right = SpriteSheet("images/player_run.png", (4, 1), 4, repeat=True)
-        run_left = SpriteSheet("images/player_run.png", (4, 1), 4, repeat=True, xflip=True)
-        airborne = SpriteSheet("images/player_falling.png", (3, 1), 3, repeat=False)
-        jumping = SpriteSheet("images/player_jumping.png", (1, 1), 1)
-        self.sprite.add_animation(
-            {"idle_right": idle_right,
-             "run_right": run_right,
-             "run_left": run_left,
-             "airborne": airborne,
-             "jumping": jumping}
-        )
+        self.sprite.add_animation(Player.load_animations())
         self.sprite.start_animation("idle_right")
         self.falling = False
 
         self.move_direction = 0  # right 1, left -1
 
+    @staticmethod
+    def load_animations():
+        return {
+            "idle_right": assets.sprite_sheet("images/player_idle.png", (8, 1), 8, repeat=True),
+            "run_right": assets.sprite_sheet("images/player_run.png", (4, 1), 4, repeat=True),
+            "run_left": assets.sprite_sheet("images/player_run.png", (4, 1), 4, repeat=True, xflip=True),
+            "airborne": assets.sprite_sheet("images/player_falling.png", (3, 1), 3, repeat=False),
+            "jumping": assets.sprite_sheet("images/player_jumping.png", (1, 1), 1),
+        }
+
     def update(self, dt, events):
         self.sprite.update(dt)
 
-        for projectile in self.projectiles[:]:
+        for projectile in self.projectiles:
             projectile.update(dt, events)
             if (projectile.position - Pose((c.WINDOW_WIDTH//2, c.WINDOW_HEIGHT//2))).magnitude() > c.WINDOW_WIDTH*3:
                 self.projectiles.remove(projectile)
-            if (projectile.pickup or projectile.gravity) and (projectile.position - self.position).magnitude() < 30:
-                self.projectiles.remove(projectile)
-                self.ammo += 1
-                self.game.pickup_kunai.play()
 
         if self.beaming:
             self.velocity = (self.beam_target - self.position)*1.5
-            self.position += self.velocity * dt
+            self.position.add_pose(self.velocity, weight=dt)
             return
 
         gravity = 3000
@@ -85,8 +81,7 @@ class Player(GameObject):
             self.sprite.start_animation("idle_right")
             self.move_direction = 0
 
-        mpos = pygame.mouse.get_pos()
-        relmpos = Pose(mpos) * (c.GAME_WIDTH/c.WINDOW_WIDTH) - self.position
+        relmpos = self.game.mouse_position() - self.position
 
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -113,17 +108,29 @@ class Player(GameObject):
             control_velocity.y = 0
             self.position.y = self.game.floor - 20
 
-        self.position += self.velocity * dt + control_velocity * dt + self.recoil_velocity * dt
+        self.position.add_pose(self.velocity, weight=dt)
+        self.position.add_pose(control_velocity, weight=dt)
+        self.position.add_pose(self.recoil_velocity, weight=dt)
 
         if self.position.x < 0 or self.position.x > c.WINDOW_WIDTH:
             self.position.x = max(0, min(c.WINDOW_WIDTH, self.position.x))
             self.recoil_velocity.x = 0
 
-        for enemy in self.game.enemies[:]:
-            if enemy.destroyed:
-                continue
-            if (enemy.position - self.position).magnitude() < 50:
-                self.get_hit_by_enemy(enemy)
+    def get_loose_projectiles(self):
+        """ Kunai lying on the ground or falling, which can be picked back up """
+        loose = [projectile for projectile in self.projectiles if projectile.pickup or projectile.gravity]
+        return loose, [projectile.position.get_position() for projectile in loose]
+
+    def pick_up_projectile(self, projectile):
+        if projectile in self.projectiles:
+            self.projectiles.remove(projectile)
+            self.ammo += 1
+            self.game.pickup_kunai.play()
+
+    def touch_enemy(self, enemy):
+        #   Getting hit destroys every enemy, so only the first touch counts
+        if not enemy.destroyed and not self.beaming:
+            self.get_hit_by_enemy(enemy)
 
     def land(self):
         self.jumps = 2
@@ -142,9 +149,8 @@ class Player(GameObject):
         self.velocity = Pose((0, 0))
         self.recoil_velocity += (self.position - enemy.position) * (5000/(self.position - enemy.position).magnitude())
         self.charge = 0
-        for i in range(50):
-            self.game.particles.append(KunaiHitParticle(self.position.get_position(), color=(255, 50, 50)))
-            self.game.shake(direction = (enemy.position - self.position).get_position(), amt=70)
+        self.game.sparks.kunai_hit(self.position.get_position(), count=50, color=(255, 50, 50))
+        self.game.shake(direction = (enemy.position - self.position).get_position(), amt=70)
 
     def jump(self):
         self.grounded = False
@@ -186,4 +192,4 @@ class Player(GameObject):
         self.ammo -= 1
         velocity = velocity * (1/velocity.magnitude()) * 4000
         self.recoil_velocity -= velocity * 0.3
-        self.projectiles.append(Kunai(self.game, velocity=velocity.get_position(), position=self.position.get_position()))
\ No newline at end of file
+        self.projectiles.add(Kunai(self.game, velocity=velocity.get_position(), position=self.position.get_position()))
\ No newline at end of file
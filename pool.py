@@ -0,0 +1,58 @@
+class ParticlePool:
+    """ Keeps finished particles around so new ones can be made by resetting
+        an old object instead of allocating one. Each particle class has its
+        own free list, capped at the size given for it.
+    """
+
+    def __init__(self, sizes=None, default_size=16):
+        """ sizes: dictionary of particle class to the most finished particles
+                of that class to hold on to
+            default_size: the cap for any class not in sizes
+        """
+        self.sizes = sizes or {}
+        self.default_size = default_size
+        self.free = {}
+        self.live = {}
+        self.high_water = {}
+        self.allocated = {}
+        self.reused = {}
+
+    def acquire(self, cls, *args, **kwargs):
+        """ Return a particle of class cls initialized with args and kwargs,
+            recycled from the free list if there is one.
+        """
+        free = self.free.get(cls)
+        if free:
+            particle = free.pop()
+            particle.reset(*args, **kwargs)
+            self.reused[cls] = self.reused.get(cls, 0) + 1
+        else:
+            particle = cls(*args, **kwargs)
+            self.allocated[cls] = self.allocated.get(cls, 0) + 1
+        live = self.live.get(cls, 0) + 1
+        self.live[cls] = live
+        if live > self.high_water.get(cls, 0):
+            self.high_water[cls] = live
+        return particle
+
+    def release(self, particle):
+        """ Hand back a particle that is finished with. """
+        cls = type(particle)
+        self.live[cls] = self.live.get(cls, 0) - 1
+        free = self.free.setdefault(cls, [])
+        if len(free) < self.sizes.get(cls, self.default_size):
+            free.append(particle)
+
+    def stats(self):
+        """ Return a dictionary of class name to its allocation counts. """
+        classes = set(self.allocated) | set(self.reused)
+        return {
+            cls.__name__: {
+                "allocated": self.allocated.get(cls, 0),
+                "reused": self.reused.get(cls, 0),
+                "live": self.live.get(cls, 0),
+                "high_water": self.high_water.get(cls, 0),
+                "free": len(self.free.get(cls, [])),
+            }
+            for cls in classes
+        }
@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 
 class GameObject:
     def __init__(self, game):
@@ -15,12 +17,15 @@ class GameObject:
 
 
 class Pose:
+
+    __slots__ = ("x", "y", "angle")
+
     def __init__(self, position, angle=0):
         """ Initialize the Pose.
             position: two-length tuple (x, y)
             angle: angle, in degrees counterclockwise from right ->
         """
-        self.set_position(position)
+        self.x, self.y = position
         self.angle = angle
 
     def set_x(self, new_x):
@@ -57,32 +62,40 @@ class Pose:
 
     def add_position(self, position):
         add_x, add_y = position
-        self.set_x(self.x + add_x)
-        self.set_y(self.y + add_y)
+        self.x += add_x
+        self.y += add_y
 
     def add_angle(self, angle):
-        self.set_angle(self.angle + angle)
+        self.angle += angle
 
     def rotate_position(self, angle):
-        x = self.x*math.cos(angle*math.pi/180) \
-            + self.y*math.sin(angle*math.pi/180)
-        y = -self.x*math.sin(angle*math.pi/180) \
-            + self.y*math.cos(angle*math.pi/180)
-        self.set_position((x, y))
+        if not angle:
+            return
+        cos = math.cos(angle*math.pi/180)
+        sin = math.sin(angle*math.pi/180)
+        self.x, self.y = self.x*cos + self.y*sin, -self.x*sin + self.y*cos
 
     def add_pose(self, other, weight=1, frame=None):
-        if frame:
+        if frame and frame.angle:
             other = other.copy()
             other.rotate_position(frame.angle)
-        self.add_position(other.get_weighted_position(weight))
-        self.add_angle(other.angle*weight)
+        self.x += other.x*weight
+        self.y += other.y*weight
+        self.angle += other.angle*weight
 
     def distance_to(self, other):
-        return (self - other).magnitude()
+        return math.sqrt(self.distance_squared_to(other))
+
+    def distance_squared_to(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx*dx + dy*dy
 
     def magnitude(self):
-        distance = math.sqrt(self.x*self.x + self.y*self.y)
-        return distance
+        return math.sqrt(self.x*self.x + self.y*self.y)
+
+    def magnitude_squared(self):
+        return self.x*self.x + self.y*self.y
 
     def clear(self):
         self.x = 0
@@ -90,7 +103,7 @@ class Pose:
         self.angle = 0
 
     def copy(self):
-        return Pose(self.get_position(), self.angle)
+        return Pose((self.x, self.y), self.angle)
 
     def scale_to(self, magnitude):
         """ Scale the X and Y components of the Pose to have a particular
@@ -104,22 +117,36 @@ class Pose:
         self.x *= magnitude / my_magnitude
         self.y *= magnitude / my_magnitude
 
+    # The arithmetic operators build their result directly rather than going
+    # through copy() and add_pose(), and the in-place ones don't allocate at
+    # all; they run for nearly every entity every frame.
+
     def __add__(self, other):
-        copy = self.copy()
-        copy.add_pose(other)
-        return copy
+        return Pose((self.x + other.x, self.y + other.y), self.angle + other.angle)
 
     def __sub__(self, other):
-        copy = self.copy()
-        copy.add_pose(other, weight=-1)
-        return copy
+        return Pose((self.x - other.x, self.y - other.y), self.angle - other.angle)
 
     def __mul__(self, other):
-        copy = self.copy()
-        copy.x *= other
-        copy.y *= other
-        copy.angle *= other
-        return copy
+        return Pose((self.x * other, self.y * other), self.angle * other)
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.angle += other.angle
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.angle -= other.angle
+        return self
+
+    def __imul__(self, other):
+        self.x *= other
+        self.y *= other
+        self.angle *= other
+        return self
 
     def __pow__(self, other):
         copy = self.copy()
@@ -149,4 +176,222 @@ class PhysicsObject(GameObject):
 
     def update(self, dt, events):
         self.velocity.add_pose(self.acceleration, weight=dt)
-        self.pose.add_pose(self.velocity, weight=dt)
\ No newline at end of file
+        self.pose.add_pose(self.velocity, weight=dt)
+
+
+class PoseView(Pose):
+    """ A Pose whose x and y live in one row of a PoseBatch array, so an
+        entity can keep using Pose arithmetic on its own position while the
+        batch moves every row at once. The angle is stored on the view.
+    """
+
+    __slots__ = ("batch", "array", "handle")
+
+    def __init__(self, batch, array, handle):
+        self.batch = batch
+        self.array = array
+        self.handle = handle
+        self.angle = 0
+
+    @property
+    def x(self):
+        return getattr(self.batch, self.array)[self.handle.index, 0]
+
+    @x.setter
+    def x(self, value):
+        getattr(self.batch, self.array)[self.handle.index, 0] = value
+
+    @property
+    def y(self):
+        return getattr(self.batch, self.array)[self.handle.index, 1]
+
+    @y.setter
+    def y(self, value):
+        getattr(self.batch, self.array)[self.handle.index, 1] = value
+
+
+class PoseHandle:
+    """ Stable reference to a row of a PoseBatch. Rows move when others are
+        removed; the batch keeps index up to date.
+    """
+
+    __slots__ = ("index", "owner")
+
+    def __init__(self, index, owner=None):
+        self.index = index
+        self.owner = owner
+
+
+class PoseBatch:
+    """ Positions and velocities of many entities, kept in NumPy arrays so a
+        whole group can be moved, damped or measured with one call. Extra
+        per-entity numbers can be stored alongside them as named scalars.
+
+        Rows only get PoseHandles once add() has been used. Until then,
+        extend() and compact() touch nothing but the arrays.
+    """
+
+    def __init__(self, capacity=64, scalars=()):
+        self.count = 0
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.scalars = {name: np.zeros(capacity) for name in scalars}
+        self.handles = None  # one PoseHandle per row, made by the first add()
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, capacity):
+        self.capacity = capacity
+        for name in ("positions", "velocities"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, 2))
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        for name, old in self.scalars.items():
+            new = np.zeros(capacity)
+            new[:self.count] = old[:self.count]
+            self.scalars[name] = new
+
+    def add(self, position=(0, 0), velocity=(0, 0), owner=None, **scalars):
+        """ Add a row and return its PoseHandle. """
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        index = self.count
+        self.positions[index] = position
+        self.velocities[index] = velocity
+        for name, array in self.scalars.items():
+            array[index] = scalars.get(name, 0)
+        if self.handles is None:
+            self.handles = [PoseHandle(row) for row in range(index)]
+        handle = PoseHandle(index, owner)
+        self.handles.append(handle)
+        self.count += 1
+        return handle
+
+    def extend(self, positions, velocities, **scalars):
+        """ Add one row per position in one go. Scalars may be one number or
+            one per row.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        number = len(positions)
+        if self.count + number > self.capacity:
+            self.grow(max(self.capacity * 2, self.count + number))
+        new = slice(self.count, self.count + number)
+        self.positions[new] = positions
+        self.velocities[new] = velocities
+        for name, array in self.scalars.items():
+            array[new] = scalars.get(name, 0)
+        if self.handles is not None:
+            self.handles += [PoseHandle(index) for index in range(self.count, self.count + number)]
+        self.count += number
+
+    def compact(self, keep):
+        """ Drop every row where keep is False, keeping the rest in order. """
+        rows = np.flatnonzero(keep)
+        kept = len(rows)
+        if kept == self.count:
+            return
+        #   Gathering rows by index is several times faster than masking a
+        #   two-column array
+        for array in [self.positions, self.velocities] + list(self.scalars.values()):
+            array[:kept] = array.take(rows, axis=0)
+        if self.handles is not None:
+            self.compact_handles(keep)
+        self.count = kept
+
+    def compact_handles(self, keep):
+        handles = []
+        for handle, keep_row in zip(self.handles, keep.tolist()):
+            if keep_row:
+                handle.index = len(handles)
+                handles.append(handle)
+            else:
+                handle.index = None
+        self.handles = handles
+
+    def remove(self, handle):
+        """ Remove a row by moving the last row into its place. """
+        index = handle.index
+        last = self.count - 1
+        if index != last:
+            self.positions[index] = self.positions[last]
+            self.velocities[index] = self.velocities[last]
+            for array in self.scalars.values():
+                array[index] = array[last]
+            moved = self.handles[last]
+            moved.index = index
+            self.handles[index] = moved
+        self.handles.pop()
+        handle.index = None
+        self.count -= 1
+
+    def clear(self):
+        if self.handles is not None:
+            for handle in self.handles:
+                handle.index = None
+            self.handles = []
+        self.count = 0
+
+    def position(self, handle):
+        return PoseView(self, "positions", handle)
+
+    def velocity(self, handle):
+        return PoseView(self, "velocities", handle)
+
+    def owners(self, indices=None):
+        """ Return the owners of every row, or of the given row indices. """
+        if self.handles is None:
+            return [None] * (self.count if indices is None else len(indices))
+        if indices is None:
+            return [handle.owner for handle in self.handles]
+        return [self.handles[index].owner for index in indices]
+
+    def live_positions(self):
+        return self.positions[:self.count]
+
+    def live_velocities(self):
+        return self.velocities[:self.count]
+
+    def scalar(self, name):
+        return self.scalars[name][:self.count]
+
+    def integrate(self, dt):
+        """ Move every position by its velocity over dt seconds. """
+        self.positions[:self.count] += self.velocities[:self.count] * dt
+
+    def scale_velocities(self, factor):
+        """ Multiply every velocity by factor, either one number or one per row. """
+        factor = np.asarray(factor, dtype=float)
+        if factor.ndim == 1:
+            factor = factor[:, None]
+        self.velocities[:self.count] *= factor
+
+    def add_velocities(self, delta):
+        self.velocities[:self.count] += delta
+
+    def add_positions(self, delta):
+        self.positions[:self.count] += delta
+
+    def normalize_velocities(self, magnitude=1):
+        """ Scale every velocity to the given magnitude, or one per row. Zero
+            velocities point right, like Pose.scale_to.
+        """
+        velocities = self.velocities[:self.count]
+        lengths = np.hypot(velocities[:, 0], velocities[:, 1])
+        still = lengths == 0
+        velocities[still] = (1, 0)
+        lengths[still] = 1
+        velocities *= (np.asarray(magnitude, dtype=float) / lengths)[:, None]
+
+    def offsets_to(self, point):
+        """ Return, for every row, the vector from its position to point. """
+        return np.asarray(point, dtype=float) - self.positions[:self.count]
+
+    def distances_squared_to(self, point):
+        offsets = self.offsets_to(point)
+        return np.einsum("ij,ij->i", offsets, offsets)
+
+    def distances_to(self, point):
+        return np.sqrt(self.distances_squared_to(point))
@@ -3,7 +3,8 @@ from primitives import Pose
 import math
 import constants as c
 import random
-from particle import KunaiHitParticle
+from assets import assets
+from trail import Trail
 
 class Projectile:
 
@@ -20,7 +21,13 @@ class Projectile:
 class Kunai:
 
     surf = None
-    shadow_surf = None
+
+    #   Rotated copies of the kunai, one list per angle bucket. Each list holds
+    #   the shadow variants, from faintest to strongest, then the kunai itself.
+    atlas = None
+    angle_steps = 64
+    shadow_alpha_step = 10
+    shadow_max_alpha = 60
 
     def __init__(self, game, position = (0, 0), velocity = (0, 0)):
         self.game = game
@@ -28,22 +35,45 @@ class Kunai:
         self.position = Pose(position)
         self.last_position = self.position.copy()
         self.direction = self.velocity * (1/self.velocity.magnitude())
-        if not self.surf:
-            Kunai.surf = pygame.image.load("images/kunai.png")
-            Kunai.surf.set_colorkey((255, 255, 255))
-            Kunai.shadow_surf = Kunai.surf.copy()
+        if not self.atlas:
+            Kunai.load_atlas()
 
-        self.shadows = []
+        self.shadows = Trail(capacity=64, fade=1000)
         self.gravity = False
         self.pickup = False
         self.stuck = False
 
+    @staticmethod
+    def load_atlas():
+        """ Pre-render the kunai and its shadows at every angle bucket, so
+            drawing one never has to rotate or copy a surface.
+        """
+        Kunai.surf = assets.image("images/kunai.png", colorkey=(255, 255, 255))
+        atlas = []
+        shadow_levels = range(Kunai.shadow_alpha_step, Kunai.shadow_max_alpha + 1, Kunai.shadow_alpha_step)
+        for step in range(Kunai.angle_steps):
+            rotated = pygame.transform.rotate(Kunai.surf, step * 360 / Kunai.angle_steps)
+            frames = []
+            for alpha in shadow_levels:
+                shadow = rotated.copy()
+                shadow.set_alpha(alpha)
+                frames.append(shadow)
+            frames.append(rotated)
+            atlas.append(frames)
+        Kunai.atlas = atlas
+
+    @staticmethod
+    def get_frames(angle):
+        """ Return the atlas entry closest to angle, in degrees. """
+        step = round(angle * Kunai.angle_steps / 360) % Kunai.angle_steps
+        return Kunai.atlas[step]
+
     def launch(self, velocity):
         self.velocity = velocity.copy()
 
     def update(self, dt, events):
         self.last_position = self.position.copy()
-        self.position += self.velocity * dt
+        self.position.add_pose(self.velocity, weight=dt)
         if self.velocity.magnitude() > 1:
             self.direction = self.velocity * (1/self.velocity.magnitude())
 
@@ -57,20 +87,10 @@ class Kunai:
                 self.velocity += Pose((0, 5000)) * dt
 
             if dist != 0:
-                increment *= 1/increment.magnitude()
-                increment *= 10
-                traveled = 0
-                current = self.last_position.copy()
-                while traveled < dist:
-                    self.shadows.append([current, 60])
-                    current += increment
-                    traveled += increment.magnitude()
-
+                self.shadows.add_segment(self.last_position.get_position(), self.position.get_position(),
+                                         spacing=10, alpha=self.shadow_max_alpha)
 
-        for item in self.shadows[:]:
-            item[1] -= 1000 * dt
-            if item[1] < 0:
-                self.shadows.remove(item)
+        self.shadows.update(dt)
 
         if (self.position.x > c.WINDOW_WIDTH or self.position.x < 0) and not self.stuck:
             self.position.x = min(c.WINDOW_WIDTH, max(0, self.position.x))
@@ -95,10 +115,9 @@ class Kunai:
             self.game.kunai_hit.play()
 
     def hit_effect(self, velocity=None):
-        for i in range(30):
-            if not velocity:
-                velocity = self.velocity.get_position()
-            self.game.particles.append(KunaiHitParticle(self.position.get_position(), velocity))
+        if not velocity:
+            velocity = self.velocity.get_position()
+        self.game.sparks.kunai_hit(self.position.get_position(), velocity, count=30)
         self.game.shake(velocity, 10)
 
     def hit(self, enemy):
@@ -109,14 +128,14 @@ class Kunai:
 
     def draw(self, surface, offset=(0, 0)):
         angle = math.atan2(-self.direction.y, self.direction.x)
-        surf = pygame.transform.rotate(self.surf, math.degrees(angle))
-
-        for item in self.shadows[:]:
-            if item[1] > 0:
-                ssurf = surf.copy()
-                pos = item[0] + Pose(offset) - Pose((ssurf.get_width()//2, ssurf.get_height()//2))
-                ssurf.set_alpha(item[1])
-                surface.blit(ssurf, pos.get_position())
+        frames = Kunai.get_frames(math.degrees(angle))
+        surf = frames[-1]
+
+        for (x, y), alpha in self.shadows.samples():
+            if alpha > 0:
+                level = min(math.ceil(alpha / self.shadow_alpha_step), len(frames) - 1)
+                ssurf = frames[level - 1]
+                surface.blit(ssurf, (x + offset[0] - ssurf.get_width()//2, y + offset[1] - ssurf.get_height()//2))
 
         pos = self.position + Pose(offset) - Pose((surf.get_width()//2, surf.get_height()//2))
         if self.pickup:
@@ -0,0 +1,126 @@
+import weakref
+
+import pygame
+
+
+class RenderTarget:
+    """ Stands in for the screen while the world is drawn at a fraction of
+        its resolution. It takes blit(), blits() and fill() in game
+        coordinates, the same as the screen would, and draws onto a smaller
+        offscreen surface instead, using a scaled-down copy of each surface
+        made the first time it's drawn. present() scales the finished frame
+        up to the window with a single blit.
+
+        A scaled copy is kept for as long as its surface is alive, and picks
+        up changes to the surface's alpha and colorkey, but not to its
+        pixels. Whatever redraws a surface after it has been drawn here
+        should call forget() with it.
+    """
+
+    def __init__(self, size, scale):
+        """ size: size of the screen being stood in for, in game coordinates
+            scale: size of the offscreen surface, as a fraction of size
+        """
+        self.size = tuple(size)
+        self.scale = scale
+        self.surface = pygame.Surface((round(size[0] * scale), round(size[1] * scale))).convert()
+        self.scaled = weakref.WeakKeyDictionary()  # surface -> its scaled-down copy
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def point(self, point):
+        """ point, in game coordinates, on the offscreen surface """
+        return round(point[0] * self.scale), round(point[1] * self.scale)
+
+    def rect(self, rect):
+        """ rect, in game coordinates, on the offscreen surface. Edges are
+            rounded rather than the size, so neighbouring rects don't gap.
+        """
+        x, y, width, height = rect
+        left, top = self.point((x, y))
+        right, bottom = self.point((x + width, y + height))
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def source(self, surf):
+        """ The scaled-down copy of surf, made the first time it's asked for """
+        scaled = self.scaled.get(surf)
+        if scaled is None:
+            width, height = surf.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            scaled = pygame.transform.scale(surf, size)
+            if surf.get_colorkey() is not None:
+                scaled.set_colorkey(surf.get_colorkey(), pygame.RLEACCEL)
+            self.scaled[surf] = scaled
+        elif scaled.get_colorkey() != surf.get_colorkey():
+            scaled.set_colorkey(surf.get_colorkey(), pygame.RLEACCEL)
+        if scaled.get_alpha() != surf.get_alpha():
+            scaled.set_alpha(surf.get_alpha())
+        return scaled
+
+    def forget(self, surf):
+        """ Drop surf's scaled copy, after its pixels have changed """
+        self.scaled.pop(surf, None)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if area is not None:
+            area = self.rect(area)
+        return self.surface.blit(self.source(source), self.point(dest), area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=True):
+        scale = self.scale
+        sources = {}  # sequences tend to repeat a few surfaces many times
+
+        def scaled(item):
+            source, dest, *rest = item
+            if source not in sources:
+                sources[source] = self.source(source)
+            if rest and rest[0] is not None:
+                rest[0] = self.rect(rest[0])
+            return (sources[source], (round(dest[0] * scale), round(dest[1] * scale)), *rest)
+        return self.surface.blits(map(scaled, blit_sequence), doreturn=doreturn)
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is not None:
+            rect = self.rect(rect)
+        return self.surface.fill(color, rect, special_flags)
+
+    def copy(self):
+        """ The frame so far, scaled back up to full size """
+        return pygame.transform.scale(self.surface, self.size)
+
+    def present(self, window):
+        """ Scale the frame up to fill window """
+        pygame.transform.scale(self.surface, window.get_size(), window)
+
+
+#   pygame.draw functions for things drawn on either the screen or a RenderTarget
+
+def draw_circle(surf, color, center, radius):
+    if isinstance(surf, RenderTarget):
+        return pygame.draw.circle(surf.surface, color, surf.point(center), radius * surf.scale)
+    return pygame.draw.circle(surf, color, center, radius)
+
+
+def draw_rect(surf, color, rect):
+    if isinstance(surf, RenderTarget):
+        return pygame.draw.rect(surf.surface, color, surf.rect(rect))
+    return pygame.draw.rect(surf, color, rect)
+
+
+def draw_polygon(surf, color, points):
+    if isinstance(surf, RenderTarget):
+        return pygame.draw.polygon(surf.surface, color, [(x * surf.scale, y * surf.scale) for x, y in points])
+    return pygame.draw.polygon(surf, color, points)
+
+
+def forget(surf, source):
+    """ Tell surf, if it's a RenderTarget, that source's pixels have changed """
+    if isinstance(surf, RenderTarget):
+        surf.forget(source)
@@ -0,0 +1,51 @@
+class SpatialHash:
+    """ Uniform grid of buckets for finding what is near a point without
+        checking everything. Rebuilt from scratch each frame, since nearly
+        everything in it moves every frame anyway.
+    """
+
+    def __init__(self, cell_size=128):
+        """ cell_size: width and height of each bucket, in pixels. Works best
+            around twice the largest radius queried.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, x, y):
+        key = self.cell(x, y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+
+    def rebuild(self, items):
+        """ Empty the grid and insert each item at its position. """
+        self.cells.clear()
+        for item in items:
+            self.insert(item, item.position.x, item.position.y)
+
+    def query(self, x, y, radius):
+        """ Return everything in the buckets touching the square around
+            (x, y) of half-width radius. Callers do the exact test.
+        """
+        if not self.cells:
+            return []
+        left, top = self.cell(x - radius, y - radius)
+        right, bottom = self.cell(x + radius, y + radius)
+        found = []
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found += bucket
+        return found
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.cells.values())
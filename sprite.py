@@ -6,6 +6,8 @@ import pygame
 #   Python libraries
 import time
 
+from assets import assets
+
 class SpriteSheet(object):
     """ Sprite sheet object for pygame. """
 
@@ -36,8 +38,9 @@ class SpriteSheet(object):
     def load_image_file(self):
         """ Reads the sprite sheet image file and computes dimensions """
 
-        #   Load the image from path as a pygame surface
-        self.sheet_img = pygame.image.load(self.img_path)
+        #   Load the image from path as a pygame surface, converted and cached
+        #   the same way as every other image
+        self.sheet_img = assets.image(self.img_path)
 
         #   Determine surface width and height
         self.sheet_height = self.sheet_img.get_height()
@@ -50,6 +53,7 @@ class SpriteSheet(object):
         #   Determine frame size, in pixels
         frame_height = int(self.sheet_height / self.y_size)
         frame_width = int(self.sheet_width / self.x_size)
+        colorkey = self.sheet_img.get_colorkey()
 
         #   Make an empty list to store frames in
         self.frames = []
@@ -57,30 +61,31 @@ class SpriteSheet(object):
         #   Repeat for each frame in animation
         for idx in range(self.frame_num):
 
-            #   Initialize a surface object for the frame
-            frame = pygame.Surface((frame_width, frame_height))
-            trans_color = (254, 0, 0)
-            frame.fill(trans_color)
-            frame.set_colorkey(trans_color)
-
-            #   Crop the frame number into a pygame surface
+            #   Crop the frame number out of the sheet. Each frame is its own
+            #   copy, since keyed frames blit faster run-length encoded, and
+            #   subsurfaces can't be.
             x_origin, y_origin = self.get_frame_position(idx)
-            frame.blit(self.sheet_img, (-x_origin, -y_origin))
+            rect = pygame.Rect(int(x_origin), int(y_origin), frame_width, frame_height)
+            frame = self.sheet_img.subsurface(rect.clip(self.sheet_img.get_rect())).copy()
 
             if self.reverse_x:
                 frame = pygame.transform.flip(frame, 1, 0)
 
+            if colorkey is not None:
+                frame.set_colorkey(colorkey, pygame.RLEACCEL)
+
             #   Add frame to list
             self.frames.append(frame)
 
 
     def reverse(self, xbool, ybool):
         """ Reverses the frames of the animation based on which booleans are
-        True. """
+        True. Sheets from assets.sprite_sheet are shared, so ask it for
+        xflip=True rather than reversing one of those. """
 
-        #   Flip each frame
-        for idx, frame in enumerate(self.frames):
-            self.frames[idx] = pygame.transform.flip(frame, xbool, ybool)
+        #   Flip each frame. Anything still holding the old frame list keeps
+        #   its frames, so build a new one rather than flipping in place.
+        self.frames = [pygame.transform.flip(frame, xbool, ybool) for frame in self.frames]
 
 
     def get_frame_position(self, n):
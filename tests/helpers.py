@@ -0,0 +1,69 @@
+""" Shared by the tests and benchmarks.py: a game set up without its menus,
+    and the background drawn the way it was before it was cached, to check
+    and time the compositor against.
+"""
+
+import pygame
+
+import constants as c
+
+
+def load_game(screen):
+    """ A Game with its assets loaded and a run set up, without its menus """
+    from game import Game
+    game = Game.__new__(Game)
+    game.screen = screen
+    game.colorblind_mode = True
+    game.last_distance = None
+    game.load_assets()
+    game.init()
+    return game
+
+
+def draw_layers(game, surf, tint, lightener, offset=(0, 0)):
+    """ The background pass as it was before BackgroundCompositor: every
+        layer blitted every frame, with the night tint filled into tint and
+        the colorblind lightener blended on top. Both are screen-sized.
+    """
+    day = game.day
+    margin = max(0, game.background.get_height() - c.GAME_HEIGHT)
+    surf.blit(game.background, (0, 0), area=pygame.Rect((0, margin * day, c.GAME_WIDTH, game.horizon)))
+    bra = pygame.Rect((0, margin * (1 - day) + (c.GAME_HEIGHT - game.horizon)/2, c.GAME_WIDTH, c.GAME_HEIGHT - game.horizon))
+    surf.blit(game.background_reflection, (0, game.horizon), area=bra)
+
+    sun_peak_height = game.sun.get_height() * 1.5
+    sx = c.GAME_WIDTH//2 - game.sun.get_width()//2 + offset[0]
+    sy = int(game.horizon - sun_peak_height * day + offset[1])
+    surf.blit(game.sun, (sx, sy), area=(0, 0, game.sun.get_width(), int(sun_peak_height * day)))
+
+    bbw, bbh = game.background_buildings.get_size()
+    bbx = int((-game.xpos * 0.1) % bbw - bbw + offset[0])
+    bby = int(game.horizon + offset[1])
+    while bbx < c.GAME_WIDTH:
+        surf.blit(game.background_buildings, (bbx, bby - bbh))
+        surf.blit(game.bb_reflection, (bbx, bby))
+        bbx += bbw
+
+    game.water_shade.set_alpha(60 + 20 * day)
+    surf.blit(game.water_shade, (0, game.horizon + offset[1]))
+    surf.blit(game.water_texture, (0, game.horizon + offset[1]), special_flags=pygame.BLEND_ADD)
+
+    fbw, fbh = game.foreground_buildings.get_size()
+    fbx = int((-game.xpos * 0.7) % fbw - fbw + offset[0])
+    fby = int(c.GAME_HEIGHT + offset[1] - fbh + 30)
+    while fbx < c.GAME_WIDTH:
+        surf.blit(game.foreground_buildings, (fbx, fby))
+        fbx += fbw
+
+    tint.fill([max(0, int(item * day)) for item in game.blue_color[:3]])
+    surf.blit(tint, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    if game.colorblind_mode:
+        surf.blit(lightener, (0, 0))
+
+    train_width = game.train.get_width()
+    train_start_x = c.GAME_WIDTH//2 - train_width//2 + offset[0] - 5 - train_width
+    for number in range(3):
+        xo, yo = game.get_train_offset(number)
+        train_x = int(train_start_x + number * 5 + number * train_width + xo)
+        train_y = int(game.floor - 5 + yo + offset[1])
+        surf.blit(game.train, (train_x, train_y), special_flags=pygame.BLEND_MULT)
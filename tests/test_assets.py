@@ -0,0 +1,83 @@
+import threading
+
+import pygame
+import pytest
+
+from assets import AssetRegistry
+
+
+@pytest.fixture
+def registry():
+    pygame.init()
+    return AssetRegistry()
+
+
+def test_get_caches(registry):
+    calls = []
+    first = registry.get("key", lambda: calls.append(1) or object())
+    assert registry.get("key", lambda: calls.append(1) or object()) is first
+    assert calls == [1]
+    assert registry.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_get_does_not_hold_the_lock_while_loading(registry):
+    loading = threading.Event()
+    finish = threading.Event()
+
+    def slow():
+        loading.set()
+        finish.wait(5)
+        return "slow"
+
+    worker = threading.Thread(target=registry.get, args=("slow", slow))
+    worker.start()
+    assert loading.wait(5)
+    assert registry.get("fast", lambda: "fast") == "fast"
+    finish.set()
+    worker.join()
+    assert registry.get("slow", lambda: "again") == "slow"
+
+
+def test_racing_loads_share_the_first_result(registry):
+    loading = threading.Barrier(2)
+
+    def load():
+        loading.wait(5)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("key", load))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results[0] is results[1]
+
+
+def test_preload_reads_and_decodes(registry):
+    registry.preload(["images/sun.png", "sounds/jump.wav"])
+    registry.wait()
+
+    assert isinstance(registry.preloaded["images/sun.png"], pygame.Surface)
+    with open("sounds/jump.wav", "rb") as file:
+        assert registry.preloaded["sounds/jump.wav"] == file.read()
+
+    sun = registry.image("images/sun.png")
+    assert sun.get_size() == pygame.image.load("images/sun.png").get_size()
+    assert "images/sun.png" not in registry.preloaded
+
+
+def test_preload_skips_what_was_already_asked_for(registry):
+    registry.image("images/sun.png")
+    registry.preload(["images/sun.png", "images/train.png"])
+    registry.wait()
+
+    assert list(registry.preloaded) == ["images/train.png"]
+    registry.discard_preloaded()
+    assert registry.preloaded == {}
+
+
+def test_preload_errors_surface_in_wait(registry):
+    registry.preload(["images/missing.png"])
+    with pytest.raises(FileNotFoundError):
+        registry.wait()
@@ -0,0 +1,96 @@
+import numpy as np
+import pygame
+import pytest
+
+import constants as c
+from helpers import draw_layers, load_game
+
+
+@pytest.fixture(scope="module")
+def game():
+    pygame.init()
+    screen = pygame.display.set_mode((c.WINDOW_WIDTH, c.WINDOW_HEIGHT))
+    return load_game(screen)
+
+
+def render(game, colorblind, day, xpos, offset):
+    """ The background drawn by the compositor and by every layer in turn """
+    game.colorblind_mode = colorblind
+    game.day = day
+    game.xpos = xpos
+    game.game_time = 0.3
+
+    tint = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    lightener = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    lightener.fill((255, 255, 255))
+    lightener.set_alpha(30)
+    expected = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    draw_layers(game, expected, tint, lightener, offset)
+
+    drawn = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    game.draw_background(drawn, offset)
+    return pygame.surfarray.array3d(expected).astype(int), pygame.surfarray.array3d(drawn).astype(int)
+
+
+#   Days the lighting table has an exact entry for
+STEPS = [0, 51, 307, 511]
+
+
+@pytest.mark.parametrize("step", STEPS)
+@pytest.mark.parametrize("xpos", [0, 1234, 98765])
+@pytest.mark.parametrize("offset", [(0, 0), (3, 2)])
+def test_matches_drawing_every_layer(game, step, xpos, offset):
+    day = game.background_compositor.lighting.day(step)
+    expected, drawn = render(game, False, day, xpos, offset)
+    assert (expected == drawn).all()
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_colorblind_matches_drawing_every_layer(game, step):
+    """ The lightener is folded into the tint as a multiply and an add,
+        which can round differently from blending it, but only slightly.
+    """
+    day = game.background_compositor.lighting.day(step)
+    expected, drawn = render(game, True, day, 1234, (0, 0))
+    assert np.abs(expected - drawn).max() <= 2
+
+
+def test_reflection_keeps_the_buildings_key(game):
+    compositor = game.background_compositor
+    key = compositor.buildings.get_colorkey()
+    assert compositor.bb_reflection.get_colorkey() == key
+    assert game.bb_reflection.get_colorkey() == key
+    for alpha in (60, 80):
+        shaded = compositor.shaded_reflection(alpha)
+        assert shaded.get_colorkey() == key
+        keyed = pygame.mask.from_threshold(compositor.bb_reflection, key, (1, 1, 1, 255))
+        assert pygame.mask.from_threshold(shaded, key, (1, 1, 1, 255)).overlap_area(keyed, (0, 0)) == keyed.count()
+
+
+@pytest.mark.parametrize("alpha", [60, 71, 80])
+@pytest.mark.parametrize("x", [0, -123, -399])
+def test_building_strip_matches_tiles(game, alpha, x):
+    """ The pre-tiled strip over an already shaded sky draws the same as
+        blitting each building and reflection tile, then shading the water.
+    """
+    compositor = game.background_compositor
+    buildings, reflection = game.background_buildings, game.bb_reflection
+    bbw, bbh = buildings.get_size()
+    horizon = int(game.horizon)
+    shade = game.water_shade
+    shade.set_alpha(alpha)
+
+    sky = pygame.Surface((c.GAME_WIDTH, c.GAME_HEIGHT)).convert()
+    sky.blit(game.background, (0, 0))
+
+    tiled = sky.copy()
+    for tile_x in range(x, c.GAME_WIDTH, bbw):
+        tiled.blit(buildings, (tile_x, horizon - bbh))
+        tiled.blit(reflection, (tile_x, horizon))
+    tiled.blit(shade, (0, horizon))
+
+    stripped = sky.copy()
+    stripped.blit(shade, (0, horizon))
+    stripped.blit(compositor.get_building_strip(alpha), (x, horizon - bbh))
+
+    assert (pygame.surfarray.array3d(tiled) == pygame.surfarray.array3d(stripped)).all()
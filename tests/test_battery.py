@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+from battery import BatterySwarm
+
+
+class Sound:
+    def play(self):
+        pass
+
+
+def swarm(charge):
+    pygame.init()
+    game = SimpleNamespace(player=SimpleNamespace(charge=charge), pickup_battery=Sound())
+    return BatterySwarm(game), game.player
+
+
+def test_collect_adds_capacity_as_int():
+    batteries, player = swarm(10)
+    batteries.spawn((0, 0), 3, capacity=2)
+    batteries.spawn((50, 0), 1, capacity=5)
+    batteries.collect(None, [0, 2, 3])
+
+    assert player.charge == 19
+    assert type(player.charge) is int
+    assert len(batteries) == 1
+
+
+def test_collect_caps_charge():
+    batteries, player = swarm(120)
+    batteries.spawn((0, 0), 4, capacity=3)
+    batteries.collect(None, [0, 1, 2, 3])
+
+    assert player.charge == 125
+    assert type(player.charge) is int
+    assert len(batteries) == 0
+
+
+def test_swarm_rows_have_no_handles():
+    """ Nothing in the swarm refers to a single battery, so spawning and
+        collecting shouldn't make a PoseHandle per row.
+    """
+    batteries, player = swarm(0)
+    batteries.spawn((0, 0), 200)
+    batteries.collect(None, list(range(0, 200, 3)))
+    assert batteries.batch.handles is None
+    assert len(batteries) == 133
+
+
+def settled_swarm():
+    """ Two settled batteries sharing a cell, one alone in another and one
+        too young to merge, sitting in the first cell
+    """
+    batteries, player = swarm(0)
+    age = batteries.merge_age + 1
+    batteries.batch.extend(
+        [(10, 10), (30, 20), (100, 100), (12, 12)],
+        [(0, 0), (40, 0), (0, 0), (0, 0)],
+        seek_speed=[100, 300, 100, 100],
+        capacity=[1, 3, 2, 5],
+        age=[age, age, age, 0],
+    )
+    return batteries
+
+
+def test_merge_keeps_total_capacity():
+    batteries = settled_swarm()
+    batteries.merge()
+    assert batteries.batch.scalar("capacity").sum() == 11
+    assert len(batteries) == 3
+
+
+def test_merge_uses_capacity_weighted_center():
+    batteries = settled_swarm()
+    batteries.merge()
+    batch = batteries.batch
+    merged = np.flatnonzero(batch.scalar("capacity") == 4)
+    assert len(merged) == 1
+    assert np.allclose(batch.live_positions()[merged[0]], (25, 17.5))
+    assert np.allclose(batch.live_velocities()[merged[0]], (30, 0))
+    assert batch.scalar("seek_speed")[merged[0]] == 300
+
+
+def test_merge_leaves_young_batteries_alone():
+    batteries = settled_swarm()
+    batteries.merge()
+    batch = batteries.batch
+    young = np.flatnonzero(batch.scalar("age") == 0)
+    assert len(young) == 1
+    assert np.allclose(batch.live_positions()[young[0]], (12, 12))
+    assert batch.scalar("capacity")[young[0]] == 5
+
+
+def test_merge_keeps_a_battery_in_every_cell():
+    batteries, player = swarm(0)
+    batteries.spawn((0, 0), 500)
+    batch = batteries.batch
+    batch.live_positions()[:] = np.random.random((500, 2)) * 400 - 200
+    batch.scalar("age")[:] = batteries.merge_age + 1
+    cells = {tuple(cell) for cell in np.floor(batch.live_positions() / batteries.merge_radius).astype(int)}
+
+    batteries.merge()
+    merged_cells = [tuple(cell) for cell in np.floor(batch.live_positions() / batteries.merge_radius).astype(int)]
+    assert sorted(merged_cells) == sorted(cells)
+    assert batch.scalar("capacity").sum() == 500
@@ -0,0 +1,95 @@
+import numpy as np
+
+from collision import CollisionWorld
+
+
+def test_overlap_is_strictly_inside_the_radius():
+    pairs = CollisionWorld.overlapping(np.array([[0.0, 0.0]]), np.array([[3.0, 4.0], [2.9, 4.0], [-3.0, -4.0]]), 5)
+    assert pairs.tolist() == [[0, 1]]
+
+
+def test_overlap_with_an_empty_layer():
+    some = np.array([[0.0, 0.0]])
+    none = np.zeros((0, 2))
+    for first, second in [(some, none), (none, some), (none, none)]:
+        pairs = CollisionWorld.overlapping(first, second, 10)
+        assert pairs.shape == (0, 2)
+
+
+def world_of(layers):
+    """ A CollisionWorld over the given {name: [(body, (x, y)), ...]} """
+    world = CollisionWorld()
+    for name, entries in layers.items():
+        world.add_layer(name, lambda entries=entries: ([body for body, _ in entries], [pos for _, pos in entries]))
+    return world
+
+
+def test_callback_gets_each_overlapping_pair():
+    world = world_of({
+        "player": [("player", (0, 0))],
+        "enemies": [("near", (10, 0)), ("far", (100, 0)), ("also near", (0, -10))],
+    })
+    touched = []
+    world.on_overlap("player", "enemies", 20, lambda a, b: touched.append((a, b)))
+    world.resolve()
+    assert touched == [("player", "near"), ("player", "also near")]
+
+
+def test_batched_callback_gets_index_arrays():
+    world = world_of({
+        "player": [("player", (0, 0))],
+        "pickups": [(None, (100, 0)), (None, (5, 5)), (None, (200, 0)), (None, (-5, 0))],
+    })
+    calls = []
+    world.on_overlap("player", "pickups", 20, lambda first, second: calls.append((first, second)), batched=True)
+    world.resolve()
+
+    assert len(calls) == 1
+    first, second = calls[0]
+    assert isinstance(first, np.ndarray) and isinstance(second, np.ndarray)
+    assert first.tolist() == [0, 0]
+    assert second.tolist() == [1, 3]
+
+
+def test_batched_callback_is_skipped_when_nothing_overlaps():
+    world = world_of({"player": [("player", (0, 0))], "pickups": [(None, (100, 0))]})
+    calls = []
+    world.on_overlap("player", "pickups", 20, lambda *args: calls.append(args), batched=True)
+    world.resolve()
+    assert calls == []
+
+
+def test_callbacks_may_remove_bodies():
+    """ Layers are gathered before any callback runs, so removing bodies
+        from a layer mid-resolve neither skips nor repeats a pair, and later
+        rules still see the frame as it was.
+    """
+    enemies = [("a", (0, 0)), ("b", (1, 0)), ("c", (2, 0))]
+    player = [("player", (0, 0))]
+    world = CollisionWorld()
+    world.add_layer("player", lambda: ([body for body, _ in player], [pos for _, pos in player]))
+    world.add_layer("enemies", lambda: ([body for body, _ in enemies], [pos for _, pos in enemies]))
+
+    hit = []
+    seen = []
+
+    def kill(player_body, enemy):
+        hit.append(enemy)
+        enemies[:] = [entry for entry in enemies if entry[0] != enemy]
+
+    world.on_overlap("player", "enemies", 10, kill)
+    world.on_overlap("player", "enemies", 10, lambda _, enemy: seen.append(enemy))
+    world.resolve()
+
+    assert hit == ["a", "b", "c"]
+    assert seen == ["a", "b", "c"]
+    assert enemies == []
+
+
+def test_rules_run_in_the_order_added():
+    world = world_of({"a": [("a", (0, 0))], "b": [("b", (0, 0))]})
+    order = []
+    world.on_overlap("a", "b", 1, lambda *_: order.append(1))
+    world.on_overlap("b", "a", 1, lambda *_: order.append(2))
+    world.resolve()
+    assert order == [1, 2]
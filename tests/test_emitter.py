@@ -0,0 +1,108 @@
+import numpy as np
+import pygame
+import pytest
+
+from emitter import SparkEmitter
+
+
+def add_sparks(sparks, count, duration=1, age=0, velocity=(0, 0), drag=(1, 1), pull=0, pull_limit=0):
+    sparks.add(count, (100, 50), np.tile(velocity, (count, 1)), np.full(count, age, dtype=float),
+               duration, SparkEmitter.CIRCLE, 10, drag=drag, pull=pull, pull_limit=pull_limit)
+
+
+def test_spawn_appends_sparks():
+    sparks = SparkEmitter(capacity=8)
+    add_sparks(sparks, 3, velocity=(10, 0))
+    add_sparks(sparks, 2, velocity=(0, 5), duration=2)
+
+    assert len(sparks) == 5
+    assert sparks.position[:5].tolist() == [[100, 50]] * 5
+    assert sparks.velocity[:5].tolist() == [[10, 0]] * 3 + [[0, 5]] * 2
+    assert sparks.duration[:5].tolist() == [1, 1, 1, 2, 2]
+
+
+def test_spawn_grows_past_capacity():
+    sparks = SparkEmitter(capacity=4)
+    add_sparks(sparks, 3, velocity=(1, 2))
+    add_sparks(sparks, 6, velocity=(3, 4))
+
+    assert len(sparks) == 9
+    assert sparks.capacity >= 9
+    assert sparks.velocity[:9].tolist() == [[1, 2]] * 3 + [[3, 4]] * 6
+
+
+def test_spawn_helpers_add_the_requested_count():
+    sparks = SparkEmitter()
+    sparks.kunai_hit((0, 0), velocity=(1, 0), count=5)
+    sparks.boom((0, 0), count=7)
+    sparks.laser_boom((0, 0), direction=(-1, 0), count=9)
+
+    assert len(sparks) == 21
+    assert (sparks.shape[:5] == SparkEmitter.SHARD).all()
+    assert (sparks.shape[5:21] == SparkEmitter.CIRCLE).all()
+    assert (sparks.velocity[12:21, 0] <= 0).all()
+
+
+def test_update_moves_and_ages():
+    sparks = SparkEmitter()
+    add_sparks(sparks, 2, velocity=(10, -20), age=0.25)
+    sparks.update(0.5)
+
+    assert sparks.position[:2].tolist() == [[105, 40]] * 2
+    assert sparks.age[:2].tolist() == [0.75] * 2
+
+
+def test_update_applies_drag_per_second():
+    sparks = SparkEmitter()
+    add_sparks(sparks, 1, velocity=(100, 100), drag=(0.25, 1))
+    sparks.update(0.5)
+
+    assert sparks.velocity[0].tolist() == pytest.approx([50, 100])
+
+
+def test_update_pulls_until_the_limit():
+    sparks = SparkEmitter()
+    add_sparks(sparks, 1, velocity=(0, 0), pull=-100, pull_limit=-30)
+    for _ in range(4):
+        sparks.update(0.125)
+
+    assert sparks.velocity[0, 0] == pytest.approx(-37.5)
+
+
+def test_update_removes_expired_and_keeps_the_rest_packed():
+    sparks = SparkEmitter()
+    add_sparks(sparks, 2, duration=1, velocity=(1, 0))
+    add_sparks(sparks, 3, duration=3, velocity=(2, 0))
+    add_sparks(sparks, 1, duration=1, velocity=(3, 0))
+    sparks.update(1.5)
+
+    assert len(sparks) == 3
+    assert sparks.velocity[:3, 0].tolist() == [2, 2, 2]
+    assert sparks.duration[:3].tolist() == [3, 3, 3]
+
+    sparks.update(2)
+    assert len(sparks) == 0
+
+
+def test_clear():
+    sparks = SparkEmitter()
+    add_sparks(sparks, 4)
+    sparks.clear()
+    sparks.update(0.1)
+
+    assert len(sparks) == 0
+
+
+def test_draw_skips_sparks_that_have_shrunk_away():
+    pygame.init()
+    surf = pygame.Surface((200, 100))
+    sparks = SparkEmitter()
+    add_sparks(sparks, 1, duration=1, age=0.99)
+    sparks.draw(surf)
+
+    assert pygame.mask.from_threshold(surf, (255, 255, 255), (1, 1, 1, 255)).count() == 0
+
+    add_sparks(sparks, 1, duration=1, age=0)
+    sparks.draw(surf)
+    assert surf.get_at((100, 50))[:3] == (255, 255, 255)
+
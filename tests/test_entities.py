@@ -0,0 +1,70 @@
+import pytest
+
+from entities import EntityList
+
+
+class Thing:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def names(entities):
+    return [thing.name for thing in entities]
+
+
+def filled(ordered):
+    return EntityList([Thing(name) for name in "abcdef"], ordered=ordered)
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_removal_is_deferred_until_flush(ordered):
+    entities = filled(ordered)
+    b, d = entities.items[1], entities.items[3]
+    entities.remove(b)
+    entities.remove(d)
+    entities.remove(d)
+
+    assert len(entities) == 4
+    assert b not in entities
+    assert names(entities) == ["a", "c", "e", "f"]
+    assert len(entities.items) == 6
+
+    assert sorted(names(entities.flush())) == ["b", "d"]
+    assert len(entities.items) == 4
+    assert entities.flush() == []
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_remove_while_iterating(ordered):
+    entities = filled(ordered)
+    for thing in entities:
+        if thing.name in "ace":
+            entities.remove(thing)
+        if thing.name == "f":
+            entities.add(Thing("g"))
+    entities.flush()
+
+    assert sorted(names(entities)) == ["b", "d", "f", "g"]
+    assert all(entities.items[entities.slots[thing]] is thing for thing in entities)
+
+
+def test_ordered_flush_keeps_order():
+    entities = filled(True)
+    for thing in list(entities)[::2]:
+        entities.remove(thing)
+    entities.flush()
+    entities.add(Thing("g"))
+
+    assert names(entities) == ["b", "d", "f", "g"]
+    assert all(entities.items[entities.slots[thing]] is thing for thing in entities)
+
+
+def test_unordered_flush_fills_gaps_from_the_end():
+    entities = filled(False)
+    entities.remove(entities.items[0])
+    entities.flush()
+
+    assert names(entities) == ["f", "b", "c", "d", "e"]
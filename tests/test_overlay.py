@@ -0,0 +1,69 @@
+import numpy as np
+import pygame
+import pytest
+
+from overlay import OverlayManager
+
+SIZE = (64, 32)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode(SIZE)
+
+
+def scene():
+    """ A screen with every shade of every channel somewhere on it """
+    pixels = np.zeros(SIZE + (3,), dtype=np.uint8)
+    ramp = np.linspace(0, 255, SIZE[0] * SIZE[1]).reshape(SIZE)
+    pixels[..., 0] = ramp
+    pixels[..., 1] = ramp[::-1]
+    pixels[..., 2] = np.roll(ramp, SIZE[1] // 2, axis=1)
+    return pygame.surfarray.make_surface(pixels).convert()
+
+
+def one_after_another(overlays):
+    """ The screen with each overlay blitted on in turn, as they used to be """
+    surf = scene()
+    for color, alpha in overlays:
+        layer = pygame.Surface(SIZE)
+        layer.fill(color)
+        layer.set_alpha(alpha)
+        surf.blit(layer, (0, 0))
+    return pygame.surfarray.array3d(surf).astype(int)
+
+
+def composited(overlays):
+    surf = scene()
+    manager = OverlayManager(SIZE)
+    for color, alpha in overlays:
+        manager.add(color, alpha)
+    manager.draw(surf)
+    assert manager.pending == []
+    return pygame.surfarray.array3d(surf).astype(int)
+
+
+@pytest.mark.parametrize("alpha", [0, 1, 40, 128, 200, 254, 255])
+def test_black_then_color_matches_blitting_both(alpha):
+    """ SunExplosionLong blacks out the screen and fades its color in on top """
+    overlays = [((0, 0, 0), 255), ((255, 60, 20), alpha)]
+    assert np.abs(one_after_another(overlays) - composited(overlays)).max() <= 1
+
+
+@pytest.mark.parametrize("overlays", [
+    [((255, 255, 255), 90), ((255, 60, 20), 130)],
+    [((10, 200, 30), 30), ((0, 0, 0), 60), ((255, 255, 255), 20)],
+])
+def test_partial_overlays_match_blitting_each(overlays):
+    assert np.abs(one_after_another(overlays) - composited(overlays)).max() <= 2
+
+
+def test_single_overlay_is_drawn_as_is():
+    overlays = [((255, 60, 20), 77)]
+    assert (one_after_another(overlays) == composited(overlays)).all()
+
+
+def test_nothing_queued_leaves_the_screen_alone():
+    assert (one_after_another([]) == composited([])).all()
+    assert (one_after_another([]) == composited([((255, 0, 0), 0)])).all()
@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from primitives import Pose, PoseBatch
+
+
+def test_in_place_arithmetic_keeps_the_pose():
+    """ +=, -= and *= change the Pose itself, so every reference to it
+        sees the change, rather than rebinding the name to a new Pose.
+    """
+    pose = Pose((1, 2), 10)
+    alias = pose
+    pose += Pose((3, 4), 5)
+    assert pose is alias
+    assert (alias.x, alias.y, alias.angle) == (4, 6, 15)
+    pose -= Pose((1, 1), 1)
+    assert pose is alias
+    assert (alias.x, alias.y, alias.angle) == (3, 5, 14)
+    pose *= 2
+    assert pose is alias
+    assert (alias.x, alias.y, alias.angle) == (6, 10, 28)
+
+
+def test_arithmetic_makes_a_new_pose():
+    pose = Pose((1, 2), 10)
+    for result in (pose + Pose((1, 1)), pose - Pose((1, 1)), pose * 2):
+        assert result is not pose
+    assert (pose.x, pose.y, pose.angle) == (1, 2, 10)
+
+
+def test_pose_takes_no_other_attributes():
+    with pytest.raises(AttributeError):
+        Pose((0, 0)).speed = 1
+
+
+@pytest.mark.parametrize("frame", [None, Pose((5, 5), 0)])
+def test_add_pose_in_an_unrotated_frame(frame):
+    pose = Pose((1, 1), 0)
+    other = Pose((2, 3), 4)
+    pose.add_pose(other, weight=2, frame=frame)
+    assert (pose.x, pose.y, pose.angle) == (5, 7, 8)
+    assert (other.x, other.y, other.angle) == (2, 3, 4)
+
+
+def test_add_pose_in_a_rotated_frame():
+    pose = Pose((0, 0))
+    other = Pose((1, 0))
+    pose.add_pose(other, frame=Pose((0, 0), 90))
+    assert (pose.x, pose.y) == pytest.approx((0, -1))
+    assert (other.x, other.y) == (1, 0)
+
+
+def test_squared_distances():
+    a = Pose((1, 2))
+    b = Pose((4, 6))
+    assert a.distance_squared_to(b) == 25
+    assert a.distance_to(b) == 5
+    assert (b - a).magnitude_squared() == 25
+    assert (b - a).magnitude() == 5
+
+
+def batch_of(count, **kwargs):
+    batch = PoseBatch(capacity=2, **kwargs)
+    handles = [batch.add((i, 10 * i), (i, 0), owner=f"row {i}") for i in range(count)]
+    return batch, handles
+
+
+def test_views_read_and_write_their_row():
+    batch, handles = batch_of(3)
+    position = batch.position(handles[1])
+    velocity = batch.velocity(handles[1])
+    assert (position.x, position.y) == (1, 10)
+    assert velocity.get_position() == (1, 0)
+
+    position += Pose((5, 5))
+    assert tuple(batch.live_positions()[1]) == (6, 15)
+    velocity.set_position((7, 8))
+    assert tuple(batch.live_velocities()[1]) == (7, 8)
+
+
+def test_views_follow_rows_moved_by_remove():
+    batch, handles = batch_of(4)
+    last = batch.position(handles[3])
+    batch.remove(handles[1])
+
+    assert handles[1].index is None
+    assert handles[3].index == 1
+    assert (last.x, last.y) == (3, 30)
+    assert batch.owners() == ["row 0", "row 3", "row 2"]
+    last.x = 99
+    assert batch.live_positions()[1, 0] == 99
+
+
+def test_remove_last_row():
+    batch, handles = batch_of(3)
+    batch.remove(handles[2])
+    assert len(batch) == 2
+    assert batch.owners() == ["row 0", "row 1"]
+
+
+def test_views_follow_rows_moved_by_compact():
+    batch, handles = batch_of(5)
+    views = [batch.position(handle) for handle in handles]
+    batch.compact(np.array([True, False, True, False, True]))
+
+    assert [handle.index for handle in handles] == [0, None, 1, None, 2]
+    assert [(view.x, view.y) for view in (views[0], views[2], views[4])] == [(0, 0), (2, 20), (4, 40)]
+    assert batch.owners() == ["row 0", "row 2", "row 4"]
+    assert batch.owners([2]) == ["row 4"]
+
+
+def test_add_after_extend_hands_out_handles():
+    batch = PoseBatch()
+    batch.extend([(1, 1), (2, 2)], 0)
+    assert batch.handles is None
+    assert batch.owners() == [None, None]
+
+    handle = batch.add((3, 3), owner="added")
+    assert handle.index == 2
+    assert [h.index for h in batch.handles] == [0, 1, 2]
+    batch.compact(np.array([False, True, True]))
+    assert handle.index == 1
+    assert batch.owners() == [None, "added"]
+
+
+def test_clear_invalidates_handles():
+    batch, handles = batch_of(3)
+    batch.clear()
+    assert len(batch) == 0
+    assert all(handle.index is None for handle in handles)
+
+
+def test_extend_takes_one_scalar_or_one_per_row():
+    batch = PoseBatch(capacity=2, scalars=("capacity", "age"))
+    batch.extend([(0, 0), (1, 1), (2, 2)], [(1, 0)] * 3, capacity=[1, 2, 3], age=0.5)
+    batch.extend([(3, 3)], (0, 1))
+
+    assert len(batch) == 4
+    assert list(batch.scalar("capacity")) == [1, 2, 3, 0]
+    assert list(batch.scalar("age")) == [0.5, 0.5, 0.5, 0]
+    assert batch.live_velocities().tolist() == [[1, 0], [1, 0], [1, 0], [0, 1]]
+
+
+def test_normalize_velocities_points_still_rows_right():
+    batch = PoseBatch()
+    batch.extend([(0, 0)] * 3, [(3, 4), (0, 0), (0, -2)])
+    batch.normalize_velocities([10, 2, 1])
+
+    assert np.allclose(batch.live_velocities(), [(6, 8), (2, 0), (0, -1)])
+    assert not np.isnan(batch.live_velocities()).any()
+
+
+def test_normalize_velocities_matches_scale_to():
+    batch = PoseBatch()
+    batch.extend([(0, 0)] * 2, [(0, 0), (-5, 12)])
+    batch.normalize_velocities(3)
+    for row, velocity in zip(batch.live_velocities(), [Pose((0, 0)), Pose((-5, 12))]):
+        velocity.scale_to(3)
+        assert row == pytest.approx(velocity.get_position())
+
+
+def test_velocities_and_distances():
+    batch = PoseBatch()
+    batch.extend([(0, 0), (3, 4)], [(1, 1), (2, 2)])
+    batch.add_velocities((1, -1))
+    batch.integrate(0.5)
+
+    assert batch.live_velocities().tolist() == [[2, 0], [3, 1]]
+    assert batch.live_positions().tolist() == [[1, 0], [4.5, 4.5]]
+    assert batch.distances_to((1, 0)) == pytest.approx([0, np.hypot(3.5, 4.5)])
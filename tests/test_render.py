@@ -0,0 +1,150 @@
+import gc
+
+import pygame
+import pytest
+
+from render import RenderTarget, draw_circle, draw_polygon, draw_rect, forget
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((200, 100))
+
+
+def solid(size, color):
+    surf = pygame.Surface(size).convert()
+    surf.fill(color)
+    return surf
+
+
+def drawn_area(surf):
+    """ Bounds of everything on surf that isn't black """
+    surf.set_colorkey((0, 0, 0))
+    area = surf.get_bounding_rect()
+    surf.set_colorkey(None)
+    return area
+
+
+def test_stands_in_for_a_screen_of_its_size():
+    target = RenderTarget((200, 100), 0.5)
+    assert target.get_size() == (200, 100)
+    assert target.get_width() == 200 and target.get_height() == 100
+    assert target.surface.get_size() == (100, 50)
+
+
+def test_rects_round_their_edges():
+    target = RenderTarget((200, 100), 0.5)
+    assert target.rect((3, 3, 3, 3)) == pygame.Rect(2, 2, 1, 1)
+    #   Neighbours still meet
+    assert target.rect((0, 0, 3, 1)).right == target.rect((3, 0, 3, 1)).left
+
+
+def test_blit_draws_scaled_down():
+    target = RenderTarget((200, 100), 0.5)
+    target.fill((0, 0, 0))
+    target.blit(solid((20, 10), (255, 0, 0)), (40, 20))
+    assert target.surface.get_at((20, 10))[:3] == (255, 0, 0)
+    assert target.surface.get_at((29, 14))[:3] == (255, 0, 0)
+    assert target.surface.get_at((30, 10))[:3] == (0, 0, 0)
+    assert target.surface.get_at((20, 15))[:3] == (0, 0, 0)
+
+
+def test_blits_matches_blit():
+    red = solid((20, 10), (255, 0, 0))
+    green = solid((10, 10), (0, 255, 0))
+    sequence = [(red, (10, 10)), (green, (50, 30)), (red, (100, 60), (0, 0, 10, 10))]
+
+    one_by_one = RenderTarget((200, 100), 0.5)
+    one_by_one.fill((0, 0, 0))
+    for item in sequence:
+        one_by_one.blit(*item)
+    together = RenderTarget((200, 100), 0.5)
+    together.fill((0, 0, 0))
+    together.blits(sequence, doreturn=False)
+
+    assert pygame.image.tobytes(one_by_one.surface, "RGB") == pygame.image.tobytes(together.surface, "RGB")
+
+
+def test_fill_rect_is_scaled():
+    target = RenderTarget((200, 100), 0.5)
+    target.fill((0, 0, 0))
+    target.fill((0, 0, 255), (20, 20, 40, 20))
+    assert drawn_area(target.surface) == pygame.Rect(10, 10, 20, 10)
+
+
+def test_scaled_copy_follows_alpha_and_colorkey():
+    target = RenderTarget((200, 100), 0.5)
+    surf = solid((20, 20), (255, 0, 0))
+    surf.set_alpha(100)
+    assert target.source(surf).get_alpha() == 100
+    surf.set_alpha(200)
+    surf.set_colorkey((255, 0, 0))
+    scaled = target.source(surf)
+    assert scaled.get_alpha() == 200
+    assert scaled.get_colorkey()[:3] == (255, 0, 0)
+
+
+def test_scaled_copy_is_kept_until_forgotten():
+    target = RenderTarget((200, 100), 0.5)
+    surf = solid((20, 20), (255, 0, 0))
+    scaled = target.source(surf)
+    surf.fill((0, 255, 0))
+    assert target.source(surf) is scaled
+    forget(target, surf)
+    assert target.source(surf).get_at((0, 0))[:3] == (0, 255, 0)
+
+
+def test_scaled_copy_goes_with_its_surface():
+    target = RenderTarget((200, 100), 0.5)
+    target.source(solid((20, 20), (255, 0, 0)))
+    gc.collect()
+    assert len(target.scaled) == 0
+
+
+def test_present_fills_the_window():
+    target = RenderTarget((200, 100), 0.5)
+    target.fill((0, 0, 0))
+    target.fill((255, 255, 255), (100, 0, 100, 100))
+    window = pygame.Surface((400, 200))
+    target.present(window)
+    assert window.get_at((10, 10))[:3] == (0, 0, 0)
+    assert window.get_at((390, 190))[:3] == (255, 255, 255)
+    assert target.copy().get_size() == (200, 100)
+
+
+@pytest.mark.parametrize("draw, args", [
+    (draw_circle, ((60, 40), 20)),
+    (draw_rect, ((40, 20, 40, 40),)),
+    (draw_polygon, ([(40, 20), (80, 20), (80, 60), (40, 60)],)),
+])
+def test_draw_functions_match_the_screen(draw, args):
+    """ Drawn on a target at half scale, shapes cover the same part of the
+        frame as they do drawn on a full size surface.
+    """
+    screen = solid((200, 100), (0, 0, 0))
+    draw(screen, (255, 255, 255), *args)
+    target = RenderTarget((200, 100), 0.5)
+    target.fill((0, 0, 0))
+    draw(target, (255, 255, 255), *args)
+
+    expected = drawn_area(screen)
+    drawn = drawn_area(target.surface)
+    assert abs(drawn.centerx * 2 - expected.centerx) <= 2
+    assert abs(drawn.centery * 2 - expected.centery) <= 2
+    assert abs(drawn.width * 2 - expected.width) <= 2
+
+
+def test_forget_ignores_screens():
+    forget(solid((10, 10), (0, 0, 0)), solid((10, 10), (0, 0, 0)))
+
+
+def test_mouse_is_mapped_into_game_coordinates(monkeypatch):
+    import constants as c
+    from game import Game
+
+    game = Game.__new__(Game)
+    game.screen = pygame.Surface((c.GAME_WIDTH // 2, c.GAME_HEIGHT // 2))
+    monkeypatch.setattr(pygame.mouse, "get_pos", lambda: (10, 20))
+    position = game.mouse_position()
+    assert (position.x, position.y) == (20, 40)
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from spatial import SpatialHash
+
+
+def body(x, y):
+    return SimpleNamespace(position=SimpleNamespace(x=x, y=y))
+
+
+def test_query_finds_items_across_cell_borders():
+    grid = SpatialHash(cell_size=10)
+    corner = [body(9.5, 9.5), body(10.5, 9.5), body(9.5, 10.5), body(10.5, 10.5)]
+    far = body(45, 9.5)
+    grid.rebuild(corner + [far])
+
+    found = grid.query(9.9, 9.9, 2)
+    assert all(item in found for item in corner)
+    assert far not in found
+
+
+@pytest.mark.parametrize("x, y", [(-0.5, -0.5), (-10, 3), (-25, -35)])
+def test_query_at_negative_coordinates(x, y):
+    grid = SpatialHash(cell_size=10)
+    near = body(x, y)
+    across_zero = body(0.5, 0.5)
+    far = body(x - 40, y)
+    grid.rebuild([near, across_zero, far])
+
+    found = grid.query(x, y, 3)
+    assert near in found
+    assert far not in found
+    assert (across_zero in found) == (abs(x) < 3 and abs(y) < 3)
+
+
+def test_negative_cells_are_not_folded_onto_positive_ones():
+    grid = SpatialHash(cell_size=10)
+    assert grid.cell(-0.5, -0.5) == (-1, -1)
+    assert grid.cell(0.5, 0.5) == (0, 0)
+
+
+def test_query_returns_every_item_once():
+    grid = SpatialHash(cell_size=10)
+    items = [body(5, 5) for _ in range(3)] + [body(15, 15)]
+    grid.rebuild(items)
+    found = grid.query(10, 10, 8)
+    assert sorted(map(id, found)) == sorted(map(id, items))
+    assert len(grid) == 4
+
+
+def test_rebuild_and_clear_empty_the_grid():
+    grid = SpatialHash(cell_size=10)
+    first = body(5, 5)
+    grid.rebuild([first])
+    second = body(5, 5)
+    grid.rebuild([second])
+    assert grid.query(5, 5, 1) == [second]
+
+    grid.clear()
+    assert grid.query(5, 5, 1) == []
+    assert len(grid) == 0
@@ -0,0 +1,54 @@
+import pygame
+import pytest
+
+import constants as c
+from assets import assets
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((c.WINDOW_WIDTH, c.WINDOW_HEIGHT))
+
+
+def test_sheets_use_the_registry_image():
+    sheet = assets.sprite_sheet("images/enemy_open.png", (5, 1), 5)
+
+    assert sheet is assets.sprite_sheet("images/enemy_open.png", (5, 1), 5)
+    assert sheet.sheet_img is assets.image("images/enemy_open.png")
+
+
+@pytest.mark.parametrize("xflip", [False, True])
+def test_frames_keep_the_sheet_key(xflip):
+    sheet = assets.sprite_sheet("images/scuttle_left.png", (8, 1), 8, xflip=xflip)
+    key = sheet.sheet_img.get_colorkey()
+
+    assert key is not None
+    assert len(sheet.frames) == 8
+    for frame in sheet.frames:
+        assert frame.get_size() == (120, 120)
+        assert frame.get_colorkey() == key
+
+
+def test_flipped_frames_mirror_the_sheet():
+    sheet = assets.sprite_sheet("images/player_run.png", (4, 1), 4)
+    flipped = assets.sprite_sheet("images/player_run.png", (4, 1), 4, xflip=True)
+
+    for frame, mirrored in zip(sheet.frames, flipped.frames):
+        expected = pygame.surfarray.array3d(pygame.transform.flip(frame, 1, 0))
+        assert (pygame.surfarray.array3d(mirrored) == expected).all()
+
+
+def test_reverse_leaves_the_old_frame_list_alone():
+    from sprite import SpriteSheet
+
+    sheet = SpriteSheet("images/player_run.png", (4, 1), 4)
+    frames = sheet.frames
+    before = [pygame.image.tobytes(frame, "RGB") for frame in frames]
+    sheet.reverse(True, False)
+
+    assert sheet.frames is not frames
+    assert [pygame.image.tobytes(frame, "RGB") for frame in frames] == before
+    for frame, reversed_frame in zip(frames, sheet.frames):
+        expected = pygame.surfarray.array3d(pygame.transform.flip(frame, 1, 0))
+        assert (pygame.surfarray.array3d(reversed_frame) == expected).all()
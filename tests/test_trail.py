@@ -0,0 +1,23 @@
+from trail import Trail
+
+
+def test_trail_fades_and_drops_oldest_samples():
+    trail = Trail(capacity=8, fade=100)
+    trail.add_segment((0, 0), (30, 0), 10, 100)
+    trail.update(0.5)
+    trail.add_segment((30, 0), (50, 0), 10, 100)
+
+    assert len(trail) == 5
+    assert [alpha for _, alpha in trail.samples()] == [50, 50, 50, 100, 100]
+
+    trail.update(0.75)
+    assert len(trail) == 2
+    assert [position for position, _ in trail.samples()] == [[30, 0], [40, 0]]
+
+
+def test_trail_keeps_only_capacity_samples():
+    trail = Trail(capacity=4, fade=100)
+    trail.add_segment((0, 0), (100, 0), 10, 100)
+
+    assert len(trail) == 4
+    assert [position for position, _ in trail.samples()] == [[60, 0], [70, 0], [80, 0], [90, 0]]
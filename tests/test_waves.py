@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from enemy import EnemyRegistry, Orb, Scuttle
+from waves import OPEN, RANDOM, WAVES, SpawnTimeline, Wave
+
+LEFT, RIGHT = EnemyRegistry.LEFT, EnemyRegistry.RIGHT
+
+
+class Enemies:
+    """ Stands in for the game's EnemyRegistry; counts are set by hand """
+
+    def __init__(self):
+        self.counts = {}
+
+    def count(self, enemy, side):
+        return self.counts.get((enemy, side), 0)
+
+
+class Game:
+    """ Just enough of a Game for a SpawnTimeline, logging every spawn along
+        with the spawn clock time it happened at
+    """
+
+    def __init__(self, distance=0, multiplier=1):
+        self.start_pos = 100
+        self.xpos = self.start_pos + distance
+        self.multiplier = multiplier
+        self.enemies = Enemies()
+        self.timeline = None
+        self.spawned = []
+
+    def get_multiplier(self):
+        return self.multiplier
+
+    def spawn_scuttle(self, left):
+        self.spawned.append((self.timeline.clock, Scuttle, LEFT if left else RIGHT))
+
+    def spawn_orb(self, left):
+        self.spawned.append((self.timeline.clock, Orb, LEFT if left else RIGHT))
+
+
+def run(timeline, game, duration, dt=1/60):
+    game.timeline = timeline
+    for _ in range(round(duration / dt)):
+        timeline.update(game, dt)
+    return game.spawned
+
+
+def test_same_seed_spawns_the_same():
+    waves = [Wave(Scuttle, side=RANDOM, start=0.5, every=0.7), Wave(Orb, side=OPEN, start=1, every=2)]
+    runs = [run(SpawnTimeline(waves, seed=7, window=5), Game(), 60) for _ in range(2)]
+    assert len(runs[0]) > 100
+    assert runs[0] == runs[1]
+
+    other = run(SpawnTimeline(waves, seed=8, window=5), Game(), 60)
+    assert [side for _, _, side in other] != [side for _, _, side in runs[0]]
+
+
+def test_clock_runs_at_the_multiplier():
+    waves = [Wave(Scuttle, side=LEFT, start=1, every=1)]
+    spawned = run(SpawnTimeline(waves, seed=0), Game(multiplier=2), 5.01)
+    assert len(spawned) == 10
+
+
+@pytest.mark.parametrize("window", [1, 2.5, 7, 120])
+@pytest.mark.parametrize("dt", [1/60, 0.35, 3.1])
+def test_window_boundaries_neither_lose_nor_repeat_spawns(window, dt):
+    """ Spawns fall on and across window edges, and ticks can cover more
+        than one window.
+    """
+    waves = [
+        Wave(Scuttle, side=LEFT, start=0, every=0.5),
+        Wave(Scuttle, side=RIGHT, start=1.25, every=1.25, count=9),
+        Wave(Orb, side=LEFT, start=7),
+    ]
+    timeline = SpawnTimeline(waves, seed=0, window=window)
+    spawned = run(timeline, Game(), 31, dt)
+
+    left_scuttles = [time for time, enemy, side in spawned if enemy is Scuttle and side == LEFT]
+    right_scuttles = [time for time, enemy, side in spawned if enemy is Scuttle and side == RIGHT]
+    orbs = [time for time, enemy, side in spawned if enemy is Orb]
+    assert len(left_scuttles) == int(timeline.clock / 0.5) + 1
+    assert len(right_scuttles) == 9
+    assert len(orbs) == 1
+    #   Each spawn happens on the first tick at or after it's due
+    due = np.arange(len(left_scuttles)) * 0.5
+    assert (np.array(left_scuttles) >= due - 1e-9).all()
+    assert (np.array(left_scuttles) < due + dt + 1e-9).all()
+
+
+def test_wave_times_are_split_cleanly_between_windows():
+    wave = Wave(Scuttle, start=1, every=1.5, count=5)
+    pieces = [wave.times(begin, begin + 2) for begin in range(0, 12, 2)]
+    assert np.concatenate(pieces).tolist() == [1, 2.5, 4, 5.5, 7]
+    once = Wave(Orb, start=4)
+    assert [len(once.times(begin, begin + 2)) for begin in range(0, 8, 2)] == [0, 0, 1, 0]
+
+
+def test_open_spawn_waits_for_a_free_side_then_fires_once():
+    waves = [Wave(Orb, side=OPEN, start=1, every=1, count=3)]
+    timeline = SpawnTimeline(waves, seed=0)
+    game = Game()
+    game.enemies.counts = {(Orb, LEFT): 1, (Orb, RIGHT): 1}
+
+    assert run(timeline, game, 4) == []
+    assert timeline.held == {0: OPEN}
+
+    game.enemies.counts[(Orb, RIGHT)] = 0
+    spawned = run(timeline, game, 1)
+    assert [(enemy, side) for _, enemy, side in spawned] == [(Orb, RIGHT)]
+    assert timeline.held == {}
+
+
+def test_open_spawn_picks_the_free_side():
+    waves = [Wave(Orb, side=OPEN, start=1)]
+    game = Game()
+    game.enemies.counts = {(Orb, RIGHT): 1}
+    spawned = run(SpawnTimeline(waves, seed=0), game, 2)
+    assert [side for _, _, side in spawned] == [LEFT]
+
+
+def test_nothing_spawns_before_the_distance():
+    game = Game(distance=16799)
+    timeline = SpawnTimeline(WAVES, seed=0)
+    spawned = run(timeline, game, 100)
+    assert spawned and all(enemy is Scuttle for _, enemy, _ in spawned)
+
+    gated = [Wave(Scuttle, side=LEFT, start=0, every=1, after_distance=16800)]
+    game = Game(distance=16799)
+    timeline = SpawnTimeline(gated, seed=0)
+    assert run(timeline, game, 20) == []
+
+    #   Everything that came due while waiting is folded into one spawn
+    game.xpos += 1
+    spawned = run(timeline, game, 1/60)
+    assert len(spawned) == 1
+
+
+def test_orbs_spawn_past_the_distance():
+    game = Game(distance=16800)
+    spawned = run(SpawnTimeline(WAVES, seed=0), game, 17)
+    assert [enemy for _, enemy, _ in spawned].count(Orb) == 2
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class Trail:
+    """ Fixed-size ring buffer of fading trail samples. Positions and alphas
+        are kept in flat arrays; the oldest samples are overwritten once the
+        buffer is full, so memory use doesn't depend on speed or frame time.
+    """
+
+    def __init__(self, capacity=64, fade=1000):
+        """ capacity: most samples kept at once
+            fade: alpha lost per second by every sample
+        """
+        self.capacity = capacity
+        self.fade = fade
+        self.positions = np.zeros((capacity, 2))
+        self.alphas = np.zeros(capacity)
+        self.head = 0  # where the next sample is written
+        self.count = 0
+
+    def live_indices(self):
+        """ Indices of the live samples, oldest first. """
+        return (self.head - self.count + np.arange(self.count)) % self.capacity
+
+    def add_segment(self, start, end, spacing, alpha):
+        """ Drop samples every spacing pixels along the line from start
+            towards end, including start but not end.
+        """
+        start = np.asarray(start, dtype=float)
+        delta = np.asarray(end, dtype=float) - start
+        distance = np.hypot(*delta)
+        if distance == 0:
+            return
+        number = int(np.ceil(distance / spacing))
+        steps = np.arange(max(0, number - self.capacity), number)
+        points = start + np.outer(steps * spacing / distance, delta)
+
+        indices = (self.head + np.arange(len(steps))) % self.capacity
+        self.positions[indices] = points
+        self.alphas[indices] = alpha
+        self.head = (self.head + len(steps)) % self.capacity
+        self.count = min(self.count + len(steps), self.capacity)
+
+    def update(self, dt):
+        """ Fade every sample, then drop the ones that have faded out. Older
+            samples are always fainter, so those are at the tail.
+        """
+        self.alphas -= self.fade * dt
+        self.count -= np.count_nonzero(self.alphas[self.live_indices()] < 0)
+
+    def samples(self):
+        """ Return a list of ((x, y), alpha) for every live sample, oldest first. """
+        indices = self.live_indices()
+        return list(zip(self.positions[indices].tolist(), self.alphas[indices].tolist()))
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,130 @@
+import random
+
+import numpy as np
+
+from enemy import Orb, Scuttle, EnemyRegistry
+
+
+#   Sides a wave can spawn on, besides EnemyRegistry.LEFT and RIGHT
+RANDOM = "random"  # picked when the timeline is compiled
+OPEN = "open"  # whichever side has none of the wave's enemy yet, waiting if both do
+
+
+class Wave:
+    """ Declarative description of a stream of spawns. Times are on the
+        spawn clock, which runs at the game's difficulty multiplier, so a
+        wave spawning every 3.5 seconds of it spawns every 3.5/multiplier
+        seconds of play.
+    """
+
+    def __init__(self, enemy, side=RANDOM, start=0, every=None, count=None, after_distance=0):
+        """ enemy: enemy class, spawned with game.spawn_<class name>(left)
+            side: EnemyRegistry.LEFT or RIGHT, RANDOM or OPEN
+            start: spawn clock time of the first spawn
+            every: spawn clock time between spawns, or None to spawn once
+            count: most spawns, or None for no limit
+            after_distance: spawns due before the run has covered this many
+                pixels wait until it has
+        """
+        self.enemy = enemy
+        self.side = side
+        self.start = start
+        self.every = every
+        self.count = count
+        self.after_distance = after_distance
+
+    def times(self, begin, end):
+        """ Spawn clock times of this wave's spawns in [begin, end) """
+        if self.every is None:
+            return np.array([self.start]) if begin <= self.start < end else np.zeros(0)
+        first = max(0, int(np.ceil((begin - self.start) / self.every)))
+        last = int(np.ceil((end - self.start) / self.every))
+        if self.count is not None:
+            last = min(last, self.count)
+        return self.start + np.arange(first, max(first, last)) * self.every
+
+
+#   The spawning the game has always done: a scuttle every 3.5/multiplier
+#   seconds, and past multiplier 1.4 an orb every 8/multiplier seconds on
+#   whichever side doesn't have one
+WAVES = [
+    Wave(Scuttle, side=RANDOM, start=3.5, every=3.5),
+    Wave(Orb, side=OPEN, start=8, every=8, after_distance=16800),
+]
+
+
+class SpawnTimeline:
+    """ Compiles waves into one sorted array of spawn events and walks it
+        with a cursor, so each tick only looks at the events that are due.
+        The timeline is compiled a window at a time, since waves can repeat
+        forever. Given the same seed and the same game state, it spawns the
+        same things at the same times.
+    """
+
+    def __init__(self, waves=WAVES, seed=None, window=120):
+        self.waves = waves
+        self.random = random.Random(seed)
+        self.window = window
+        self.clock = 0
+        self.compiled_until = 0
+        self.times = np.zeros(0)
+        self.events = []
+        self.cursor = 0
+        self.held = {}  # wave index -> side, for spawns that are due but waiting
+        self.compile_next()
+
+    def compile_next(self):
+        """ Compile the next window of the timeline, dropping the part
+            already played.
+        """
+        begin, end = self.compiled_until, self.compiled_until + self.window
+        times = []
+        events = []
+        for index, wave in enumerate(self.waves):
+            wave_times = wave.times(begin, end)
+            times.append(wave_times)
+            for _ in wave_times:
+                side = wave.side
+                if side == RANDOM:
+                    side = self.random.choice((EnemyRegistry.LEFT, EnemyRegistry.RIGHT))
+                events.append((index, side))
+        times = np.concatenate(times) if times else np.zeros(0)
+        order = np.argsort(times, kind="stable")
+        self.times = np.concatenate((self.times[self.cursor:], times[order]))
+        self.events = self.events[self.cursor:] + [events[i] for i in order.tolist()]
+        self.cursor = 0
+        self.compiled_until = end
+
+    def update(self, game, dt):
+        """ Advance the spawn clock and spawn everything that's due. """
+        self.clock += dt * game.get_multiplier()
+        while self.clock >= self.compiled_until:
+            self.compile_next()
+        while self.cursor < len(self.times) and self.times[self.cursor] <= self.clock:
+            index, side = self.events[self.cursor]
+            self.cursor += 1
+            if not self.try_spawn(game, index, side):
+                #   A wave only ever has one spawn waiting; later ones fold into it
+                self.held[index] = side
+        for index, side in list(self.held.items()):
+            if self.try_spawn(game, index, side):
+                del self.held[index]
+
+    def try_spawn(self, game, index, side):
+        """ Spawn one of the wave's enemies now if it can, and say whether it did. """
+        wave = self.waves[index]
+        if game.xpos - game.start_pos < wave.after_distance:
+            return False
+        if side == OPEN:
+            left_open = not game.enemies.count(wave.enemy, EnemyRegistry.LEFT)
+            right_open = not game.enemies.count(wave.enemy, EnemyRegistry.RIGHT)
+            if left_open and right_open:
+                side = self.random.choice((EnemyRegistry.LEFT, EnemyRegistry.RIGHT))
+            elif left_open:
+                side = EnemyRegistry.LEFT
+            elif right_open:
+                side = EnemyRegistry.RIGHT
+            else:
+                return False
+        getattr(game, "spawn_" + wave.enemy.__name__.lower())(side == EnemyRegistry.LEFT)
+        return True